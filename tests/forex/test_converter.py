@@ -3,7 +3,12 @@ from fastapi.testclient import TestClient
 from vibe2025.forex.main import app
 from vibe2025.forex.cache import forex_cache
 
-client = TestClient(app)
+
+@pytest.fixture(scope="session")
+def client():
+    """Single client for the session, so startup/shutdown run only once."""
+    with TestClient(app) as c:
+        yield c
 
 
 @pytest.fixture(autouse=True)
@@ -14,14 +19,14 @@ def clear_cache():
     forex_cache.clear()
 
 
-def test_root():
+def test_root(client):
     """Test root endpoint."""
     response = client.get("/")
     assert response.status_code == 200
     assert "message" in response.json()
 
 
-def test_convert_valid():
+def test_convert_valid(client):
     """Test valid currency conversion."""
     response = client.get("/convert?pair=EURUSD&volume=100")
     assert response.status_code == 200
@@ -29,7 +34,7 @@ def test_convert_valid():
     assert isinstance(response.json()["result"], float)
 
 
-def test_convert_uses_cache():
+def test_convert_uses_cache(client):
     """Test that subsequent requests use cache."""
     # First request - should fetch from API
     response1 = client.get("/convert?pair=EURUSD&volume=100")
@@ -41,14 +46,14 @@ def test_convert_uses_cache():
     assert response1.json()["result"] == response2.json()["result"]
 
 
-def test_convert_no_cache():
+def test_convert_no_cache(client):
     """Test bypassing cache with no_cache parameter."""
     response = client.get("/convert?pair=EURUSD&volume=100&no_cache=true")
     assert response.status_code == 200
     assert "result" in response.json()
 
 
-def test_cache_stats():
+def test_cache_stats(client):
     """Test cache statistics endpoint."""
     response = client.get("/cache/stats")
     assert response.status_code == 200
@@ -58,7 +63,7 @@ def test_cache_stats():
     assert "ttl_seconds" in data
 
 
-def test_cache_clear():
+def test_cache_clear(client):
     """Test cache clearing endpoint."""
     # Make a request to populate cache
     client.get("/convert?pair=EURUSD&volume=100")
@@ -72,19 +77,25 @@ def test_cache_clear():
     assert stats["size"] == 0
 
 
-def test_convert_invalid_pair():
+def test_convert_invalid_pair(client):
     """Test invalid currency pair length."""
     response = client.get("/convert?pair=EUR&volume=100")
     assert response.status_code == 422
 
 
-def test_convert_negative_volume():
+def test_convert_non_letter_pair(client):
+    """Test currency pair with non-letter characters."""
+    response = client.get("/convert?pair=EUR1SD&volume=100")
+    assert response.status_code == 422
+
+
+def test_convert_negative_volume(client):
     """Test negative volume."""
     response = client.get("/convert?pair=EURUSD&volume=-100")
     assert response.status_code == 422
 
 
-def test_convert_missing_params():
+def test_convert_missing_params(client):
     """Test missing required parameters."""
     response = client.get("/convert")
     assert response.status_code == 422
@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from vibe2025.forex import forex
+from vibe2025.forex.cache import forex_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear cache before and after each test."""
+    forex_cache.clear()
+    yield
+    forex_cache.clear()
+
+
+class _Upstream:
+    """Stand-in for open.er-api.com that records the requested URLs."""
+    def __init__(self):
+        self.calls = []
+        self.status = 200
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    async def handle(self, request):
+        self.calls.append(str(request.url))
+        await asyncio.sleep(0.05)  # keep the fetch in flight while the other callers arrive
+        return httpx.Response(self.status, json={"result": "success", "rates": {"USD": 1.08}})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    upstream = _Upstream()
+    monkeypatch.setattr(forex, "get_client", lambda: upstream.client)
+    return upstream
+
+
+def _gather(n, **kwargs):
+    async def run():
+        return await asyncio.gather(
+            *(forex.get_exchange_rate("EUR", "USD", **kwargs) for _ in range(n)), return_exceptions=True
+        )
+    return asyncio.run(run())
+
+
+def test_concurrent_misses_share_one_fetch(upstream):
+    """Test that concurrent cache misses for one pair make a single upstream call."""
+    assert _gather(20) == [1.08] * 20
+    assert upstream.calls == ["https://open.er-api.com/v6/latest/EUR"]
+    assert forex._inflight == {}
+    assert forex_cache.get("EUR", "USD") == 1.08
+
+
+def test_upstream_error_reaches_every_waiter(upstream):
+    """Test that a failed shared fetch raises in every caller and is not remembered."""
+    upstream.status = 500
+
+    results = _gather(10)
+
+    assert len(upstream.calls) == 1
+    assert all(isinstance(r, HTTPException) and r.status_code == 503 for r in results)
+    assert forex._inflight == {}
+    assert forex_cache.get("EUR", "USD") is None
+
+    upstream.status = 200
+    assert _gather(1) == [1.08]  # the next request fetches again
+    assert len(upstream.calls) == 2
+
+
+def test_no_cache_requests_are_not_coalesced(upstream):
+    """Test that use_cache=False always calls the API."""
+    assert _gather(3, use_cache=False) == [1.08] * 3
+    assert len(upstream.calls) == 3
+    assert forex._inflight == {}
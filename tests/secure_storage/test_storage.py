@@ -1,4 +1,15 @@
+import base64
+import json
 import os
+
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from vibe2025.secure_storage import service
 from vibe2025.secure_storage.service import EncryptedStoreService
 
 
@@ -21,5 +32,158 @@ def test_roundtrip(tmp_dir='..'):
     os.remove(path)
 
 
+def test_flush_keeps_store_open(tmp_path):
+    path = str(tmp_path / "data.enc")
+    s = EncryptedStoreService(path, "superpassword")
+    s.load()
+    s.put("foo", "bar")
+    s.flush()
+
+    # still usable after flush, and the flushed state is readable from disk
+    s.put("alpha", "beta")
+    s2 = EncryptedStoreService(path, "superpassword")
+    s2.load()
+    assert s2.list_keys() == ["foo"]
+
+    s.lock()
+    s2.load()
+    assert set(s2.list_keys()) == {"foo", "alpha"}
+
+
+def test_lock_load_cycle_derives_key_once(tmp_path, monkeypatch):
+    calls = []
+    real_kdf = service.Scrypt
+
+    def counting_kdf(*args, **kwargs):
+        calls.append(kwargs["salt"])
+        return real_kdf(*args, **kwargs)
+
+    monkeypatch.setattr(service, "Scrypt", counting_kdf)
+    s = EncryptedStoreService(str(tmp_path / "data.enc"), "superpassword")
+    s.load()
+    s.put("foo", "bar")
+    s.lock()
+    s.load()
+    assert s.get("foo") == "bar"
+    s.lock()
+    assert len(calls) == 1
+
+    # a new password must not reuse the cached key
+    s.master_password = "other"
+    with pytest.raises(InvalidTag):
+        s.load()
+    assert len(calls) == 2
+
+
+def test_legacy_pbkdf2_file_is_read_and_upgraded(tmp_path):
+    path = tmp_path / "legacy.enc"
+    salt = os.urandom(16)
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100_000)
+    key = base64.urlsafe_b64encode(kdf.derive(b"superpassword"))
+    path.write_bytes(salt + Fernet(key).encrypt(json.dumps({"foo": "bar"}).encode()))
+
+    s = EncryptedStoreService(str(path), "superpassword")
+    s.load()
+    assert s.get("foo") == "bar"
+    s.lock()
+
+    assert path.read_bytes()[:4] == service.MAGIC + bytes([service.FORMAT_VERSION])
+    s.load()
+    assert s.get("foo") == "bar"
+
+
+def test_tampered_file_is_rejected(tmp_path):
+    path = tmp_path / "data.enc"
+    s = EncryptedStoreService(str(path), "superpassword")
+    s.load()
+    s.put("foo", "bar")
+    s.lock()
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(InvalidTag):
+        EncryptedStoreService(str(path), "superpassword").load()
+
+
+@pytest.mark.parametrize("algorithm", [service.ALG_AESGCM, service.ALG_CHACHA20_POLY1305])
+def test_roundtrip_with_each_cipher(tmp_path, monkeypatch, algorithm):
+    monkeypatch.setattr(service, "DEFAULT_ALGORITHM", algorithm)
+    path = tmp_path / "data.enc"
+    s = EncryptedStoreService(str(path), "superpassword")
+    s.load()
+    s.put("foo", "bar")
+    s.lock()
+    assert path.read_bytes()[4] == algorithm
+
+    # the reader follows the tag in the file, not the local default
+    monkeypatch.setattr(service, "DEFAULT_ALGORITHM", None)
+    s2 = EncryptedStoreService(str(path), "superpassword")
+    s2.load()
+    assert s2.get("foo") == "bar"
+
+
+def test_large_store_roundtrip_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "DEFAULT_ALGORITHM", service.ALG_AESGCM)
+    path = tmp_path / "data.enc"
+    s = EncryptedStoreService(str(path), "superpassword")
+    s.load()
+    values = {f"key{i}": "x" * 1000 + str(i) for i in range(300)}  # several chunks
+    values["big"] = "y" * (3 * service.CHUNK_SIZE)  # a single piece larger than a chunk
+    for key, value in values.items():
+        s.put(key, value)
+    s.lock()
+
+    # the streamed file must also be readable with the one-shot AESGCM API
+    data = path.read_bytes()
+    header, nonce = data[:service.HEADER.size], data[service.HEADER.size:service.HEADER.size + service.NONCE_SIZE]
+    key = s._derive_key(header[-service.SALT_SIZE:], (service.SCRYPT_LOG2_N, service.SCRYPT_R, service.SCRYPT_P))
+    assert json.loads(AESGCM(key).decrypt(nonce, data[len(header) + len(nonce):], header)) == values
+
+    s2 = EncryptedStoreService(str(path), "superpassword")
+    s2.load()
+    assert {k: s2.get(k) for k in s2.list_keys()} == values
+
+
+def test_failed_write_keeps_previous_store(tmp_path, monkeypatch):
+    path = tmp_path / "data.enc"
+    s = EncryptedStoreService(str(path), "superpassword")
+    s.load()
+    s.put("foo", "bar")
+    s.flush()
+    before = path.read_bytes()
+
+    def failing_encrypt(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(EncryptedStoreService, "_encrypt_aesgcm_stream", staticmethod(failing_encrypt))
+    monkeypatch.setattr(service, "DEFAULT_ALGORITHM", service.ALG_AESGCM)
+    s.put("alpha", "beta")
+    with pytest.raises(OSError):
+        s.flush()
+
+    assert path.read_bytes() == before
+    assert os.listdir(tmp_path) == ["data.enc"]
+
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_flush_keeps_file_mode(tmp_path):
+    path = tmp_path / "data.enc"
+    s = EncryptedStoreService(str(path), "superpassword")
+    s.load()
+    s.put("foo", "bar")
+    s.lock()
+    assert path.stat().st_mode & 0o777 == 0o600  # new stores are owner-only
+
+    for mode in (0o600, 0o640):
+        path.chmod(mode)
+        s = EncryptedStoreService(str(path), "superpassword")
+        s.load()
+        s.put("foo", "baz")
+        s.lock()
+        assert path.stat().st_mode & 0o777 == mode
+
+
 if __name__ == "__main__":
     test_roundtrip()
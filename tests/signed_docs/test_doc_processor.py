@@ -1,6 +1,7 @@
+import base64
 import pytest
 from datetime import datetime
-from uuid import uuid4
+from uuid import UUID, uuid4
 from pathlib import Path
 from vibe2025.signed_docs.processor import DocumentProcessor, Document, Paragraph, Signature
 
@@ -86,12 +87,35 @@ def test_save_and_load_document_signature_pair(processor_with_keys, sample_docum
     assert loaded_doc.author_id == sample_document.author_id
     assert loaded_sig.document_id == signature.document_id
     assert loaded_sig.signature == signature.signature
+    # signed_at is saved as a UTC datetime ("...Z"), so it comes back with microsecond precision
+    assert b'Z"' in pair_file.read_bytes()
+    assert loaded_sig.signed_at == signature.signed_at // 1_000 * 1_000
+    assert loaded_sig.signed_at_datetime == signature.signed_at_datetime
 
     # Verify signature is still valid after loading
     is_valid = processor.verify_signature(loaded_doc, loaded_sig)
     assert is_valid is True
 
 
+@pytest.mark.parametrize("signed_at, expected_ns", [
+    ("1969-12-31T23:59:59.500000Z", -500_000_000),
+    ("1969-12-31T23:59:59Z", -1_000_000_000),
+    ("1970-01-01T00:00:00.000001+00:00", 1_000),
+    ("2025-01-02T03:04:05.678901+02:00", 1_735_779_845_678_901_000),
+    # naive values are local time
+    ("2025-01-02T03:04:05.678901", int(datetime(2025, 1, 2, 3, 4, 5).timestamp()) * 1_000_000_000 + 678_901_000),
+])
+def test_signed_at_is_converted_exactly(processor_with_keys, sample_document, signed_at, expected_ns):
+    """Test that signed_at strings become exact epoch nanoseconds, also before 1970"""
+    processor, _ = processor_with_keys
+    data = processor.sign_document(sample_document, signator_id=5).model_dump(mode="json")
+    data["signed_at"] = signed_at
+
+    loaded = Signature(**data)
+    assert loaded.signed_at == expected_ns
+    assert Signature(**loaded.model_dump(mode="json")).signed_at == expected_ns
+
+
 def test_key_persistence_and_signature_verification(tmp_path, sample_document):
     """Test that keys can be saved, loaded, and used for verification"""
     # Create processor and generate keys
@@ -199,3 +223,115 @@ def test_manipulated_json_version_in_signature(processor_with_keys, sample_docum
     # Also verify with the tampered document itself
     is_valid_tampered = processor.verify_signature(tampered_document, manipulated_signature)
     assert is_valid_tampered is False
+
+
+def test_verify_signatures_batch(processor_with_keys, sample_document):
+    """Test batch verification returns one result per pair, in order"""
+    processor, _ = processor_with_keys
+
+    signature = processor.sign_document(sample_document, signator_id=1)
+
+    tampered_document = sample_document.model_copy(deep=True)
+    tampered_document.content[0].text = "Jane Doe"
+
+    other_processor = DocumentProcessor()
+    other_processor.generate_keys()
+    other_document = sample_document.model_copy(update={"id": uuid4()})
+    other_signature = other_processor.sign_document(other_document, signator_id=2)
+
+    # A fresh processor has no cached results, so every check hits the thread pool
+    verifier = DocumentProcessor()
+    results = verifier.verify_signatures_batch([
+        (sample_document, signature),
+        (tampered_document, signature),
+        (other_document, other_signature),
+        (sample_document, other_signature),
+        (sample_document, signature),
+    ])
+    assert results == [True, False, True, False, True]
+
+
+def test_public_keys_are_parsed_once(processor_with_keys, sample_document):
+    """Test that verifying many signatures from one signer reuses the parsed public key"""
+    processor, _ = processor_with_keys
+    signature = processor.sign_document(sample_document, signator_id=42)
+    processor._verified.clear()
+
+    public_key = processor._load_public_key(signature.public_key)
+    assert processor._load_public_key(signature.public_key) is public_key
+    assert processor.verify_signature(sample_document, signature) is True
+    assert len(processor._pubkey_cache) == 1
+
+
+def test_signature_algorithm_must_match_key(processor_with_keys, sample_document):
+    """Test that a signature claiming a different algorithm than its key is rejected"""
+    processor, _ = processor_with_keys
+    signature = processor.sign_document(sample_document, signator_id=1)
+    assert signature.algorithm == "ed25519"
+
+    relabeled = signature.model_copy(update={"algorithm": "rsa"})
+    assert processor.verify_signature(sample_document, relabeled) is False
+    assert processor.verify_signature(sample_document, signature) is True
+
+
+def test_signature_bytes_serialize_as_base64_and_accept_legacy_hex(processor_with_keys, sample_document):
+    """Test that signatures are written as base64 and old hex-encoded ones still load"""
+    processor, _ = processor_with_keys
+    signature = processor.sign_document(sample_document, signator_id=1)
+
+    data = signature.model_dump(mode="json")
+    assert data["signature"] == base64.b64encode(signature.signature).decode()
+
+    data["signature"] = signature.signature.hex()
+    legacy = Signature(**data)
+    assert legacy.signature == signature.signature
+    assert processor.verify_signature(sample_document, legacy) is True
+
+
+def test_verify_signature_bytes(processor_with_keys, sample_document):
+    """Test verifying against pre-serialized canonical JSON"""
+    processor, _ = processor_with_keys
+    signature = processor.sign_document(sample_document, signator_id=1)
+
+    assert processor.verify_signature_bytes(sample_document.canonical_json(), signature) is True
+
+    tampered_document = sample_document.model_copy(deep=True)
+    tampered_document.content[0].text = "Jane Doe"
+    assert processor.verify_signature_bytes(tampered_document.canonical_json(), signature) is False
+
+
+def test_canonical_json_is_stable():
+    """Canonical bytes are the signing contract: they must not change across library versions"""
+    document = Document(
+        id=UUID("12345678-1234-5678-1234-567812345678"),
+        author_id=1,
+        addressee_id=2,
+        created_at=datetime(2025, 1, 2, 3, 4, 5, 678900),
+        content=[Paragraph(fixed_text='Zażółć "gęślą"\n', placeholder="name", text="Jaźń\t")]
+    )
+    expected = (
+        '{"addressee_id":2,"author_id":1,'
+        '"content":[{"fixed_text":"Zażółć \\"gęślą\\"\\n","placeholder":"name","text":"Jaźń\\t"}],'
+        '"created_at":"2025-01-02T03:04:05.678900",'
+        '"id":"12345678-1234-5678-1234-567812345678","parent_document_id":null}'
+    ).encode("utf-8")
+    assert document.canonical_json() == expected
+    assert DocumentProcessor()._document_to_canonical_json(document) == expected
+
+
+LEGACY_PAIR = Path(__file__).parents[2] / "vibe2025" / "signed_docs" / "doc.json"
+
+
+def test_pair_signed_before_canonical_json_still_verifies():
+    """Test that the bundled doc.json, signed over model_dump_json(), still verifies"""
+    processor = DocumentProcessor()
+    document, signature = processor.load_document_signature_pair(str(LEGACY_PAIR))
+    assert signature.json_version != document.canonical_json()
+
+    assert processor.verify_signature(document, signature) is True
+    assert processor.verify_signature_bytes(document.canonical_json(), signature) is True
+    assert processor.verify_signatures_batch([(document, signature)]) == [True]
+
+    tampered_document = document.model_copy(update={"author_id": document.author_id + 1})
+    assert processor.verify_signature(tampered_document, signature) is False
+    assert processor.verify_signature_bytes(tampered_document.canonical_json(), signature) is False
@@ -0,0 +1,133 @@
+import pytest
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from vibe2025.signed_docs.model import Document, Paragraph
+from vibe2025.signed_docs.processor import DocumentProcessor
+from vibe2025.signed_docs.service import SignedDocumentsService
+
+
+@pytest.fixture
+def sample_document():
+    """Fixture providing a sample document for testing"""
+    return Document(
+        id=uuid4(),
+        author_id=1,
+        addressee_id=2,
+        created_at=datetime.now(),
+        content=[Paragraph(fixed_text="Dear", placeholder="name", text="John Doe")]
+    )
+
+
+def test_verify_many(sample_document):
+    """Test batch verification against trusted keys, results in input order"""
+    signer = DocumentProcessor()
+    signer.generate_keys()
+    untrusted = DocumentProcessor()
+    untrusted.generate_keys()
+
+    service = SignedDocumentsService()
+    service.add_trusted_key(1, signer.get_public_key_pem())
+
+    signature = signer.sign_document(sample_document, signator_id=1)
+    tampered_document = sample_document.model_copy(deep=True)
+    tampered_document.content[0].text = "Jane Doe"
+    untrusted_signature = untrusted.sign_document(sample_document, signator_id=2)
+
+    pairs = [
+        (sample_document, signature),
+        (tampered_document, signature),
+        (sample_document, untrusted_signature),
+        (sample_document, signature),
+    ]
+    assert service.verify_many(pairs) == [True, False, False, True]
+    assert service.verify_many(pairs) == [service.verify_document_signature(*pair) for pair in pairs]
+    assert service.verify_many([]) == []
+
+
+def test_verify_many_rsa_signers_share_one_document(sample_document):
+    """Test batch verification of one document signed by several (legacy RSA) signers"""
+    service = SignedDocumentsService()
+    pairs = []
+    for signer_id in (1, 2, 3):
+        signer = DocumentProcessor()
+        signer.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        service.add_trusted_key(signer_id, signer.get_public_key_pem())
+        pairs.append((sample_document, signer.sign_document(sample_document, signator_id=signer_id)))
+
+    relabeled = pairs[0][1].model_copy(update={"algorithm": "ed25519"})
+    assert service.verify_many(pairs + [(sample_document, relabeled)]) == [True, True, True, False]
+
+
+def test_verify_batch_same_doc(sample_document):
+    """Test verifying many (Ed25519 and RSA) signers of one document"""
+    service = SignedDocumentsService()
+    signatures = []
+    for signer_id in (1, 2, 3):
+        signer = DocumentProcessor()
+        if signer_id == 3:
+            signer.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        else:
+            signer.generate_keys()
+        service.add_trusted_key(signer_id, signer.get_public_key_pem())
+        signatures.append(signer.sign_document(sample_document, signator_id=signer_id))
+    other_document = sample_document.model_copy(update={"id": uuid4()})
+    untrusted = DocumentProcessor()
+    untrusted.generate_keys()
+    signatures.append(untrusted.sign_document(sample_document, signator_id=4))
+
+    assert service.verify_batch_same_doc(sample_document, signatures) == [True, True, True, False]
+    assert service.verify_batch_same_doc(other_document, signatures) == [False] * 4
+    assert service.verify_batch_same_doc(sample_document, []) == []
+
+
+def test_verify_documents(sample_document):
+    """Test all-or-nothing verification of many documents"""
+    signer = DocumentProcessor()
+    signer.generate_keys()
+    service = SignedDocumentsService()
+    service.add_trusted_key(1, signer.get_public_key_pem())
+
+    signature = signer.sign_document(sample_document, signator_id=1)
+    tampered_document = sample_document.model_copy(deep=True)
+    tampered_document.content[0].text = "Jane Doe"
+
+    assert service.verify_documents([(sample_document, signature)] * 10) is True
+    assert service.verify_documents([(sample_document, signature)] * 10 + [(tampered_document, signature)]) is False
+    assert service.verify_documents([]) is True
+
+
+def test_verify_rejects_signature_carrying_another_key(sample_document):
+    """Test that a trusted signer id with a different embedded public key is rejected"""
+    signer = DocumentProcessor()
+    signer.generate_keys()
+    other = DocumentProcessor()
+    other.generate_keys()
+
+    service = SignedDocumentsService()
+    service.add_trusted_key(1, signer.get_public_key_pem())
+
+    signature = signer.sign_document(sample_document, signator_id=1)
+    assert service.verify_document_signature(sample_document, signature)
+    swapped = signature.model_copy(update={"public_key": other.get_public_key_pem()})
+    assert not service.verify_document_signature(sample_document, swapped)
+
+
+def test_pair_signed_before_canonical_json_still_verifies():
+    """Test that the bundled doc.json, signed over model_dump_json(), is accepted by every entry point"""
+    document, signature = DocumentProcessor().load_document_signature_pair(
+        str(Path(__file__).parents[2] / "vibe2025" / "signed_docs" / "doc.json")
+    )
+    service = SignedDocumentsService()
+    service.add_trusted_key(signature.signator_id, signature.public_key)
+
+    assert service.verify_document_signature(document, signature) is True
+    assert service.verify_many([(document, signature)]) == [True]
+    assert service.verify_batch_same_doc(document, [signature]) == [True]
+    assert service.verify_documents([(document, signature)]) is True
+
+    tampered_document = document.model_copy(update={"addressee_id": document.addressee_id + 1})
+    assert service.verify_document_signature(tampered_document, signature) is False
@@ -1,12 +1,13 @@
+import hashlib
 import pytest
 import tempfile
 import os
 from pathlib import Path
 
-from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
 
 from vibe2025.signed_docs.crypto_utils import generate_keys, sign_text, verify_signature, save_private_key, save_public_key, \
-    load_private_key, load_public_key
+    load_private_key, load_public_key, sign_message, verify_message
 
 
 def test_sign_and_verify_valid_signature():
@@ -63,6 +64,60 @@ def test_save_and_load_keys():
         assert verify_signature(text, signature, loaded_public_key) is True
 
 
+def test_legacy_rsa_keys_still_sign_and_verify():
+    """Test that RSA keys (pre-Ed25519 signatures) are still supported"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key = private_key.public_key()
+
+    text = "Signed before the switch to Ed25519"
+    signature = sign_text(text, private_key)
+
+    assert verify_signature(text, signature, public_key) is True
+    assert verify_signature(text, signature, generate_keys().public_key()) is False
+
+
+def test_rsa_prehashed_signatures_match_plain_ones():
+    """Test that passing the sha256 digest gives signatures interchangeable with plain RSA-PSS"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key = private_key.public_key()
+    message = b"canonical document json"
+    digest = hashlib.sha256(message).digest()
+
+    assert verify_message(message, sign_message(message, private_key, digest), public_key) is True
+    assert verify_message(message, sign_message(message, private_key), public_key, digest) is True
+    assert verify_message(message, sign_message(message, private_key), public_key,
+                          hashlib.sha256(b"other").digest()) is False
+
+
+def test_loaded_keys_are_cached_until_file_changes():
+    """Test that a key file is parsed once and re-read after it is overwritten"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        private_key_path = Path(tmpdir) / "test_private.pem"
+
+        save_private_key(generate_keys(), str(private_key_path))
+        first = load_private_key(str(private_key_path))
+        assert load_private_key(str(private_key_path)) is first
+
+        # Rotating the key must not return the stale cached object
+        save_private_key(generate_keys(), str(private_key_path))
+        rotated = load_private_key(str(private_key_path))
+        assert rotated is not first
+        assert rotated.public_key() != first.public_key()
+
+
+def test_password_protected_keys_are_not_cached():
+    """Test that an encrypted key is decrypted on every load and a wrong password still fails"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        private_key_path = Path(tmpdir) / "test_private.pem"
+
+        save_private_key(generate_keys(), str(private_key_path), "secret")
+        first = load_private_key(str(private_key_path), "secret")
+        assert load_private_key(str(private_key_path), "secret") is not first
+
+        with pytest.raises(ValueError):
+            load_private_key(str(private_key_path), "wrong")
+
+
 ## how hacks #1
 
 import os
@@ -0,0 +1,136 @@
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import orjson
+
+from vibe2025.uptime_checker.browser import ResultsTable, UptimeBrowser
+from vibe2025.uptime_checker.main import append_results
+from vibe2025.uptime_checker.models import CheckResult
+
+BUNDLED_RESULTS = Path(__file__).parents[2] / "vibe2025" / "uptime_checker" / "results.json"
+
+
+def _result(host="example.com", port=443, status="available", timestamp=datetime(2025, 1, 1, 12), response_time_ms=10.0):
+    return CheckResult(host=host, port=port, status=status, timestamp=timestamp, response_time_ms=response_time_ms)
+
+
+def test_load_bundled_results():
+    """Test that the bundled results log is JSON Lines and loads"""
+    assert BUNDLED_RESULTS.read_bytes().count(b"\n") == 1
+    results = UptimeBrowser(str(BUNDLED_RESULTS)).load_all_results()
+    assert len(results) == 4
+
+
+def test_append_results_to_log(tmp_path):
+    """Test that every cycle appends one line and the browser reads all of them"""
+    path = tmp_path / "results.json"
+    append_results(path, datetime(2025, 1, 1, 12), [_result(), _result(status="error", response_time_ms=None)])
+    append_results(path, datetime(2025, 1, 1, 13), [_result(timestamp=datetime(2025, 1, 1, 13))])
+
+    assert len(path.read_bytes().splitlines()) == 2
+    results = UptimeBrowser(str(path)).load_all_results()
+    assert len(results) == 3
+    assert results.to_check_result(1) == _result(status="error", response_time_ms=None)
+
+
+def test_append_to_legacy_snapshot(tmp_path):
+    """Test that a snapshot written by older versions stays readable after appending lines to it"""
+    path = tmp_path / "results.json"
+    snapshot = orjson.loads(BUNDLED_RESULTS.read_bytes())
+    path.write_bytes(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+    append_results(path, datetime(2025, 1, 1, 12), [_result()])
+    append_results(path, datetime(2025, 1, 1, 13), [_result(timestamp=datetime(2025, 1, 1, 13))])
+
+    results = UptimeBrowser(str(path)).load_all_results()
+    assert len(results) == len(snapshot["results"]) + 2
+    assert results.to_check_result(len(results) - 1) == _result(timestamp=datetime(2025, 1, 1, 13))
+
+
+def test_legacy_snapshot_without_appended_lines(tmp_path):
+    """Test that an untouched snapshot from older versions still loads"""
+    path = tmp_path / "results.json"
+    snapshot = orjson.loads(BUNDLED_RESULTS.read_bytes())
+    path.write_bytes(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+
+    assert len(UptimeBrowser(str(path)).load_all_results()) == len(snapshot["results"])
+
+
+def _uptime_by_scan(host, port, from_datetime, to_datetime, results):
+    """calculate_uptime as it was for plain lists: filter every result, then count"""
+    filtered = [r for r in results if r.host == host and r.port == port and from_datetime <= r.timestamp <= to_datetime]
+    response_times = [r.response_time_ms for r in filtered if r.response_time_ms is not None]
+    avg_response = sum(response_times) / len(response_times) if response_times else None
+    available = sum(1 for r in filtered if r.status == "available")
+    return {
+        "host": host,
+        "port": port,
+        "from": from_datetime.isoformat(),
+        "to": to_datetime.isoformat(),
+        "total_checks": len(filtered),
+        "available_checks": available,
+        "unavailable_checks": sum(1 for r in filtered if r.status == "unavailable"),
+        "error_checks": sum(1 for r in filtered if r.status == "error"),
+        "uptime_percentage": round(available / len(filtered) * 100, 2) if filtered else 0.0,
+        "avg_response_time_ms": round(avg_response, 2) if avg_response else None
+    }
+
+
+def test_rows_keep_their_timestamps():
+    """Test that naive and offset-aware timestamps come back unchanged, to the microsecond"""
+    timestamps = [
+        datetime(2025, 3, 30, 1, 59, 59, 999999),
+        datetime(2025, 3, 30, 3, 0, 0, 1, tzinfo=timezone(timedelta(hours=2))),
+        datetime(1969, 12, 31, 23, 59, 59, 500000, tzinfo=timezone.utc),
+        datetime(2025, 10, 26, 2, 30, tzinfo=timezone(timedelta(hours=-3, minutes=-30))),
+    ]
+    table = ResultsTable.from_check_results([_result(timestamp=t) for t in timestamps])
+
+    for i, t in enumerate(timestamps):
+        restored = table.to_check_result(i).timestamp
+        assert restored == t
+        assert restored.utcoffset() == t.utcoffset()
+
+
+def test_calculate_uptime_matches_list_scan():
+    """Test the indexed lookup against a plain scan, for lists and tables and with out-of-order rows"""
+    rng = random.Random(20251015)
+    services = [("example.com", 443), ("example.com", 80), ("10.0.0.1", 443)]
+    start = datetime(2025, 1, 1)
+    results = []
+    for _ in range(500):
+        host, port = rng.choice(services)
+        status = rng.choice(["available", "available", "unavailable", "error"])
+        results.append(_result(
+            host=host,
+            port=port,
+            status=status,
+            timestamp=start + timedelta(minutes=rng.randrange(0, 24 * 60, 5)),  # many equal timestamps
+            response_time_ms=rng.choice([None, float(rng.randrange(1, 200))]) if status == "available" else None
+        ))
+    rng.shuffle(results)
+    table = ResultsTable.from_check_results(results)
+    browser = UptimeBrowser()
+
+    ranges = [(start, start + timedelta(days=1)), (start - timedelta(days=1), start - timedelta(hours=1))]
+    for _ in range(50):
+        a, b = sorted(start + timedelta(minutes=rng.randrange(-60, 25 * 60, 5)) for _ in range(2))
+        ranges.append((a, b))
+    for host, port in services + [("missing.example", 443)]:
+        for from_dt, to_dt in ranges:
+            expected = _uptime_by_scan(host, port, from_dt, to_dt, results)
+            assert browser.calculate_uptime(host, port, from_dt, to_dt, results) == expected
+            assert browser.calculate_uptime(host, port, from_dt, to_dt, table) == expected
+
+
+def test_calculate_uptime_sees_appended_rows():
+    """Test that rows appended after a query are included in the next one"""
+    browser = UptimeBrowser()
+    table = ResultsTable.from_check_results([_result(timestamp=datetime(2025, 1, 1, 12))])
+    day = (datetime(2025, 1, 1), datetime(2025, 1, 2))
+    assert browser.calculate_uptime("example.com", 443, *day, table)["total_checks"] == 1
+
+    table.append("example.com", 443, "error", datetime(2025, 1, 1, 11))
+    stats = browser.calculate_uptime("example.com", 443, *day, table)
+    assert stats["total_checks"] == 2
+    assert stats["error_checks"] == 1
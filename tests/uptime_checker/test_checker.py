@@ -0,0 +1,62 @@
+import asyncio
+import socket
+
+from vibe2025.uptime_checker import checker
+
+
+def test_connect_falls_back_to_next_address(monkeypatch):
+    """Test that a refused first address does not hide a reachable second one"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    refused = socket.socket()
+    refused.bind(("127.0.0.1", 0))  # bound but not listening, so connecting is refused
+    port = listener.getsockname()[1]
+    addrinfos = [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", refused.getsockname()),
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+    ]
+    calls = []
+
+    async def fake_getaddrinfo(host, port, **kwargs):
+        calls.append(host)
+        return addrinfos
+
+    async def run():
+        monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", fake_getaddrinfo)
+        first = await checker.check_service_availability("multi.example", port, 1.0)
+        second = await checker.check_service_availability("multi.example", port, 1.0)
+        return first, second
+
+    monkeypatch.setattr(checker, "_dns_cache", {})
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        listener.close()
+        refused.close()
+
+    assert first.status == "available"
+    assert second.status == "available"
+    assert calls == ["multi.example"]  # the full address list was cached
+
+
+def test_connect_all_addresses_refused(monkeypatch):
+    """Test that the check reports unavailable when no address accepts"""
+    refused = socket.socket()
+    refused.bind(("127.0.0.1", 0))
+    addrinfos = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", refused.getsockname())] * 2
+
+    async def fake_getaddrinfo(host, port, **kwargs):
+        return addrinfos
+
+    async def run():
+        monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", fake_getaddrinfo)
+        return await checker.check_service_availability("down.example", 1, 1.0)
+
+    monkeypatch.setattr(checker, "_dns_cache", {})
+    try:
+        result = asyncio.run(run())
+    finally:
+        refused.close()
+
+    assert result.status != "available"
@@ -0,0 +1,254 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import orjson
+import pytest
+from cachetools import TTLCache
+
+from vibe2025.weather import windy_service
+from vibe2025.weather.windy_service import WindyService
+
+HOUR_MS = 3600 * 1000
+
+
+@pytest.fixture
+def local_tz(monkeypatch):
+    """Switch the process-local timezone (what datetime.fromtimestamp uses) for one test"""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+
+    def set_tz(name):
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+
+    yield set_tz
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def service():
+    return WindyService("test-key")
+
+
+def _hourly(start: datetime, hours: int) -> list[int]:
+    """Hourly timestamps in ms, starting at a naive local datetime"""
+    start_ms = int(start.timestamp() * 1000)
+    return [start_ms + i * HOUR_MS for i in range(hours)]
+
+
+def _aggregate_by_sample(timestamps, temps, precip, days):
+    """Reference aggregation: one datetime conversion and one dict update per sample"""
+    daily = {}
+    for i, ts_ms in enumerate(timestamps):
+        temp = temps[i] if i < len(temps) else None
+        if temp is None:
+            continue
+        prec = precip[i] if i < len(precip) else 0.0
+        day = daily.setdefault(datetime.fromtimestamp(ts_ms / 1000.0).date(), [[], 0.0])
+        day[0].append(temp)
+        day[1] += prec or 0.0
+    return [(d, min(daily[d][0]), max(daily[d][0]), daily[d][1]) for d in sorted(daily)[:days]]
+
+
+def _as_tuples(forecasts):
+    return [(f.date, f.min_temp, f.max_temp, f.precipitation_mm) for f in forecasts]
+
+
+def _assert_same(forecasts, expected):
+    assert len(forecasts) == len(expected)
+    for got, want in zip(_as_tuples(forecasts), expected):
+        assert got[:3] == want[:3]
+        assert got[3] == pytest.approx(want[3])
+
+
+@pytest.mark.parametrize("day, hours_in_day", [(30, 23), (31, 24)])
+def test_aggregate_spring_forward_day(service, local_tz, day, hours_in_day):
+    """Test that a day is split at local midnight on the day clocks go forward"""
+    local_tz("Europe/Warsaw")
+    timestamps = _hourly(datetime(2025, 3, 29), 4 * 24 - 1)  # 29 March to 1 April, one hour short
+    temps = [float(i) for i in range(len(timestamps))]  # temperature == sample index
+
+    forecasts = {f.date.day: f for f in service._aggregate_to_daily(timestamps, temps, [], 10)}
+
+    assert list(forecasts) == [29, 30, 31, 1]
+    assert forecasts[1].max_temp == len(timestamps) - 1
+    assert forecasts[day].max_temp - forecasts[day].min_temp == hours_in_day - 1
+
+
+def test_aggregate_fall_back_day(service, local_tz):
+    """Test that the 25-hour day clocks go back is one forecast"""
+    local_tz("Europe/Warsaw")
+    timestamps = _hourly(datetime(2025, 10, 25), 3 * 24)
+    temps = [float(i) for i in range(len(timestamps))]
+
+    forecasts = service._aggregate_to_daily(timestamps, temps, [1.0] * len(timestamps), 10)
+
+    assert [f.date.day for f in forecasts] == [25, 26, 27]
+    assert forecasts[1].max_temp - forecasts[1].min_temp == 24
+    assert forecasts[1].precipitation_mm == 25.0
+
+
+@pytest.mark.parametrize("tz", ["Europe/Warsaw", "America/Havana", "UTC"])
+def test_aggregate_matches_per_sample_grouping(service, local_tz, tz):
+    """Test against per-sample grouping, with shuffled samples, None temps and short precip lists"""
+    local_tz(tz)  # Havana switches DST at midnight, so a local day can start at 01:00
+    rng = random.Random(tz)
+    for trial in range(200):
+        start = datetime(2025, rng.choice([3, 10, 11]), rng.randint(1, 28), rng.randint(0, 23))
+        timestamps = _hourly(start, rng.randint(1, 24 * 8))
+        if trial % 2:
+            rng.shuffle(timestamps)
+        temps = [None if rng.random() < 0.2 else rng.uniform(-20.0, 30.0) for _ in timestamps]
+        precip = [rng.choice([None, 0.0, rng.uniform(0.0, 5.0)]) for _ in timestamps]
+        del precip[rng.randint(0, len(precip)):]
+        days = rng.randint(0, 10)
+
+        _assert_same(
+            service._aggregate_to_daily(timestamps, temps, precip, days),
+            _aggregate_by_sample(timestamps, temps, precip, days)
+        )
+
+
+def test_aggregate_none_temperatures(service, local_tz):
+    """Test that samples without a temperature are dropped together with their precipitation"""
+    local_tz("UTC")
+    timestamps = _hourly(datetime(2025, 1, 1), 48)
+    temps = [None] * 24 + [5.0] * 12 + [None] * 12
+    precip = [10.0] * 24 + [0.5] * 12 + [10.0] * 12
+
+    assert service._aggregate_to_daily(timestamps, [None] * 48, precip, 5) == []
+    forecasts = service._aggregate_to_daily(timestamps, temps, precip, 5)
+    assert _as_tuples(forecasts) == [(datetime(2025, 1, 2).date(), 5.0, 5.0, 6.0)]
+
+
+def test_parse_response_without_precipitation(service, local_tz):
+    """Test that a response without precip-surface (include_precip=False) gives zero precipitation"""
+    local_tz("UTC")
+    data = {"ts": _hourly(datetime(2025, 1, 1), 48), "temp-surface": [1.0, 3.0] * 24}
+
+    forecasts = service._parse_response(data, 2)
+
+    assert [f.as_tuple() for f in forecasts] == [(1.0, 3.0, 0.0), (1.0, 3.0, 0.0)]
+    assert WindyService("test-key", include_precip=False)._build_payload(1, 2)["parameters"] == ("temp",)
+    with pytest.raises(ValueError):
+        service._parse_response({"ts": [], "temp-surface": []}, 2)
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self.content = orjson.dumps(data)
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    """Stands in for the pooled requests session and counts the POSTs"""
+    def __init__(self, data):
+        self.data = data
+        self.bodies = []
+
+    def post(self, url, data, timeout):
+        self.bodies.append(orjson.loads(data))
+        return _FakeResponse(self.data)
+
+
+WINDY_DATA = {
+    "ts": [1735732800000, 1735736400000],  # 2025-01-01 12:00 and 13:00 UTC
+    "temp-surface": [1.0, 2.0],
+    "precip-surface": [0.5, 0.0],
+}
+
+
+def test_forecasts_are_cached_until_ttl(service, monkeypatch):
+    """Test that repeated requests for a point are served from the cache until the TTL passes"""
+    session = _FakeSession(WINDY_DATA)
+    monkeypatch.setattr(service, "_session", session)
+    now = [0.0]
+    service._cache = TTLCache(maxsize=16, ttl=windy_service.FORECAST_CACHE_TTL_SECONDS, timer=lambda: now[0])
+
+    first = service.get_forecast(49.8224, 19.0444, 1)
+    first.clear()  # callers get their own list
+    second = service.get_forecast(49.82, 19.04, 1)  # same point after rounding
+    assert len(second) == 1
+    assert len(session.bodies) == 1
+    assert session.bodies[0]["lat"] == 49.82
+
+    service.get_forecast(49.82, 19.04, 2)  # other days, other key
+    assert len(session.bodies) == 2
+
+    now[0] += windy_service.FORECAST_CACHE_TTL_SECONDS + 1
+    service.get_forecast(49.82, 19.04, 1)
+    assert len(session.bodies) == 3
+
+    service.close()
+    service.get_forecast(49.82, 19.04, 1)
+    assert len(session.bodies) == 4
+
+
+def test_async_forecasts_share_the_cache(service):
+    """Test that the async path fills and reads the same cache"""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(orjson.loads(request.content))
+        return httpx.Response(200, content=orjson.dumps(WINDY_DATA))
+
+    async def run():
+        service._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with service:
+            first = await service.get_forecast_async(49.82, 19.04, 1)
+            second = await service.get_forecast_async(49.82, 19.04, 1)
+            return first, second, service.get_forecast(49.82, 19.04, 1)
+
+    first, second, sync = asyncio.run(run())
+    assert first == second == sync
+    assert len(requests_seen) == 1
+
+
+def test_retry_adapter_config():
+    """Test that the shared session retries transient errors, POST included"""
+    retry = windy_service._ADAPTER.max_retries
+    assert retry.total == 3
+    assert "POST" in retry.allowed_methods
+    assert {429, 500, 502, 503, 504} <= set(retry.status_forcelist)
+    assert windy_service._SESSION.get_adapter(WindyService.BASE_URL) is windy_service._ADAPTER
+
+
+def test_retry_adapter_retries_unavailable(service, monkeypatch):
+    """Test that a 503 from the API is retried on the shared session instead of failing the forecast"""
+    statuses = [503, 200]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            status = statuses.pop(0)
+            body = orjson.dumps(WINDY_DATA) if status == 200 else b"{}"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(WindyService, "BASE_URL", f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setitem(os.environ, "NO_PROXY", "127.0.0.1")
+    try:
+        forecasts = service.get_forecast(49.82, 19.04, 1)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(forecasts) == 1
+    assert statuses == []
@@ -1,5 +1,6 @@
 import typer
 import shutil
+import sys
 import os
 
 app = typer.Typer()
@@ -36,10 +37,13 @@ def cp(
     """
     Copy file1 to file2, optionally preserving timestamp with -p
     """
-    shutil.copy(file1, file2)
+    target = os.path.join(file2, os.path.basename(file1)) if os.path.isdir(file2) else file2
+    # copyfile uses in-kernel copy (sendfile / copy_file_range) where available
+    shutil.copyfile(file1, target)
     if p:
-        src_stat = os.stat(file1)
-        os.utime(file2, (src_stat.st_atime, src_stat.st_mtime))
+        shutil.copystat(file1, target)
+    else:
+        shutil.copymode(file1, target)
     typer.echo(f"Copied {file1} to {file2} {'with timestamp preserved' if p else ''}")
 
 
@@ -48,8 +52,10 @@ def cat(file: str):
     """
     Display the content of the file
     """
-    with open(file, "r") as f:
-        typer.echo(f.read())
+    # stream raw bytes in 1 MiB chunks instead of reading the whole file into memory
+    with open(file, "rb", buffering=1024 * 1024) as f:
+        shutil.copyfileobj(f, sys.stdout.buffer, 1024 * 1024)
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
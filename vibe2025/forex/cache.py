@@ -1,4 +1,5 @@
 import logging
+import math
 from datetime import datetime, timedelta
 from typing import Optional
 from cachetools import TTLCache
@@ -6,9 +7,16 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+# Number of independently locked cache shards (must be a power of two)
+SHARD_COUNT = 16
+
 
 class ForexCache:
-    """Thread-safe cache for forex exchange rates with TTL."""
+    """Thread-safe cache for forex exchange rates with TTL.
+
+    Entries are spread over SHARD_COUNT TTLCache shards, each guarded by its own lock,
+    so concurrent requests for different pairs rarely contend on the same lock.
+    """
 
     def __init__(self, ttl_seconds: int = 3600, maxsize: int = 1000):
         """
@@ -18,63 +26,75 @@ class ForexCache:
             ttl_seconds: Time-to-live for cached rates in seconds (default: 1 hour)
             maxsize: Maximum number of cached rate pairs (default: 1000)
         """
-        self._cache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
-        self._lock = threading.Lock()
+        shard_maxsize = max(1, math.ceil(maxsize / SHARD_COUNT))
+        self._shards = [
+            (TTLCache(maxsize=shard_maxsize, ttl=ttl_seconds), threading.Lock())
+            for _ in range(SHARD_COUNT)
+        ]
         self.ttl_seconds = ttl_seconds
-        logger.info(f"ForexCache initialized: TTL={ttl_seconds}s, maxsize={maxsize}")
+        self.maxsize = maxsize
+        logger.info("ForexCache initialized: TTL=%ss, maxsize=%s", ttl_seconds, maxsize)
+
+    def _make_key(self, source: str, target: str) -> tuple[str, str]:
+        """Create cache key from currency pair (codes are expected upper-case)."""
+        return (source, target)
 
-    def _make_key(self, source: str, target: str) -> str:
-        """Create cache key from currency pair."""
-        return f"{source.upper()}_{target.upper()}"
+    def _shard(self, key: tuple[str, str]) -> tuple[TTLCache, threading.Lock]:
+        """Return the (cache, lock) shard responsible for a key."""
+        return self._shards[hash(key) & (SHARD_COUNT - 1)]
 
     def get(self, source: str, target: str) -> Optional[float]:
         """
         Get cached exchange rate.
 
         Args:
-            source: Source currency code
-            target: Target currency code
+            source: Source currency code (upper-case)
+            target: Target currency code (upper-case)
 
         Returns:
             Cached rate or None if not found/expired
         """
         key = self._make_key(source, target)
-        with self._lock:
-            rate = self._cache.get(key)
+        cache, lock = self._shard(key)
+        with lock:
+            rate = cache.get(key)
+        # Hot path: skip building the log call entirely unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
             if rate is not None:
-                logger.debug(f"Cache HIT: {key} = {rate}")
+                logger.debug("Cache HIT: %s = %s", key, rate)
             else:
-                logger.debug(f"Cache MISS: {key}")
-            return rate
+                logger.debug("Cache MISS: %s", key)
+        return rate
 
     def set(self, source: str, target: str, rate: float) -> None:
         """
         Store exchange rate in cache.
 
         Args:
-            source: Source currency code
-            target: Target currency code
+            source: Source currency code (upper-case)
+            target: Target currency code (upper-case)
             rate: Exchange rate value
         """
         key = self._make_key(source, target)
-        with self._lock:
-            self._cache[key] = rate
-            logger.debug(f"Cache SET: {key} = {rate}")
+        cache, lock = self._shard(key)
+        with lock:
+            cache[key] = rate
+            logger.debug("Cache SET: %s = %s", key, rate)
 
     def clear(self) -> None:
         """Clear all cached rates."""
-        with self._lock:
-            self._cache.clear()
-            logger.info("Cache cleared")
+        for cache, lock in self._shards:
+            with lock:
+                cache.clear()
+        logger.info("Cache cleared")
 
     def get_stats(self) -> dict:
-        """Get cache statistics."""
-        with self._lock:
-            return {
-                "size": len(self._cache),
-                "maxsize": self._cache.maxsize,
-                "ttl_seconds": self.ttl_seconds
-            }
+        """Get cache statistics (lock-free; size may be off by in-flight writes)."""
+        return {
+            "size": sum(len(cache) for cache, _ in self._shards),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds
+        }
 
 
 # Global cache instance
@@ -1,10 +1,43 @@
+import asyncio
 import logging
-import requests
+import httpx
 from fastapi import HTTPException
 from vibe2025.forex.cache import forex_cache
 
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive client; connections are bound to the loop that opened them,
+# so a new client is created if we are called from a different event loop.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+# Fetches currently in progress per (source, target); concurrent cache misses for
+# the same pair await one shared task instead of each calling the API.
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
 
 async def get_exchange_rate(source: str, target: str, use_cache: bool = True) -> float:
     """
@@ -21,35 +54,53 @@ async def get_exchange_rate(source: str, target: str, use_cache: bool = True) ->
     Raises:
         HTTPException: If API request fails or currency not found
     """
+    if not use_cache:
+        return await _fetch_exchange_rate(source, target, use_cache=False)
+
     # Check cache first
-    if use_cache:
-        cached_rate = forex_cache.get(source, target)
-        if cached_rate is not None:
-            logger.info(f"Using cached rate: {source}/{target} = {cached_rate}")
-            return cached_rate
+    cached_rate = forex_cache.get(source, target)
+    if cached_rate is not None:
+        logger.info("Using cached rate: %s/%s = %s", source, target, cached_rate)
+        return cached_rate
+
+    # Join a fetch already running for this pair, or start one. There is no await
+    # between the lookup and the insert, so no lock is needed on the event loop.
+    key = (source, target)
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_exchange_rate(source, target, use_cache=True))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _inflight.pop(key) if _inflight.get(key) is t else None)
+    else:
+        logger.debug("Joining in-flight fetch: %s/%s", source, target)
+
+    # Shield so one cancelled request does not cancel the fetch for the others
+    return await asyncio.shield(task)
+
 
-    # Fetch from API
+async def _fetch_exchange_rate(source: str, target: str, use_cache: bool) -> float:
+    """Fetch exchange rate from the API, storing it in the cache if use_cache is set."""
     url = f"https://open.er-api.com/v6/latest/{source}"
-    logger.debug(f"Fetching exchange rate from: {url}")
+    logger.debug("Fetching exchange rate from: %s", url)
 
     try:
-        response = requests.get(url, timeout=5)
+        response = await get_client().get(url)
         response.raise_for_status()
         data = response.json()
 
-        logger.debug(f"API response status: {data.get('result')}")
+        logger.debug("API response status: %s", data.get('result'))
 
         if data.get("result") == "success":
             rates = data.get("rates", {})
             if target not in rates:
-                logger.warning(f"Currency {target} not found in rates")
+                logger.warning("Currency %s not found in rates", target)
                 raise HTTPException(
                     status_code=404,
                     detail=f"Currency {target} not found"
                 )
 
             rate = rates[target]
-            logger.info(f"Successfully fetched rate: {source}/{target} = {rate}")
+            logger.info("Successfully fetched rate: %s/%s = %s", source, target, rate)
 
             # Cache the result
             if use_cache:
@@ -57,19 +108,19 @@ async def get_exchange_rate(source: str, target: str, use_cache: bool = True) ->
 
             return rate
         else:
-            logger.error(f"API returned unsuccessful result: {data.get('result')}")
+            logger.error("API returned unsuccessful result: %s", data.get('result'))
             raise HTTPException(
                 status_code=503,
                 detail="Exchange rate service unavailable"
             )
-    except requests.Timeout:
-        logger.error(f"Timeout fetching exchange rate for {source}/{target}")
+    except httpx.TimeoutException:
+        logger.error("Timeout fetching exchange rate for %s/%s", source, target)
         raise HTTPException(
             status_code=503,
             detail="Exchange rate service timeout"
         )
-    except requests.RequestException as e:
-        logger.error(f"Request failed for {source}/{target}: {str(e)}")
+    except httpx.HTTPError as e:
+        logger.error("Request failed for %s/%s: %s", source, target, e)
         raise HTTPException(
             status_code=503,
             detail=f"Failed to fetch exchange rates: {str(e)}"
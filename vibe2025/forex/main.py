@@ -1,25 +1,38 @@
+import atexit
 import logging
+import queue
+import sys
+from typing import Annotated
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI, HTTPException, Query
-from vibe2025.forex.forex import get_exchange_rate
-from vibe2025.forex.models import ConversionResponse
+from fastapi.responses import ORJSONResponse
+from vibe2025.forex.forex import get_exchange_rate, close_client
+from vibe2025.forex.models import ConversionResponse, CurrencyPair
 from vibe2025.forex.cache import forex_cache
-from decimal import Decimal, getcontext
 
-# Configure logging
+# Configure logging: request handlers only enqueue records, the file and console
+# writes happen on the QueueListener's background thread.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('../vibe2025.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('../vibe2025.log'),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',  # final formatting is done by the listener's handlers
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Currency Converter API",
     description="Real-time forex currency conversion with caching",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -31,34 +44,36 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Currency Converter API shutting down")
+    await close_client()
 
 
 @app.get("/convert", response_model=ConversionResponse)
 async def convert_currency(
-        pair: str = Query(..., min_length=6, max_length=6, description="Currency pair (e.g., EURUSD)"),
+        pair: Annotated[CurrencyPair, Query(description="Currency pair (e.g., EURUSD)")],
         volume: float = Query(..., gt=0, description="Amount to convert"),
         no_cache: bool = Query(False, description="Skip cache and fetch fresh rate")
 ):
     """Convert currency using live forex rates."""
-    logger.info(f"Conversion request: pair={pair}, volume={volume}, no_cache={no_cache}")
+    logger.info("Conversion request: pair=%s, volume=%s, no_cache=%s", pair, volume, no_cache)
 
-    source = pair[:3].upper()
-    target = pair[3:].upper()
+    # pair is already validated and upper-cased; interned codes make cache-key
+    # hashing and comparison cheap
+    source = sys.intern(pair[:3])
+    target = sys.intern(pair[3:])
 
     try:
         rate = await get_exchange_rate(source, target, use_cache=not no_cache)
-        logger.debug(f"Exchange rate fetched: {source}/{target} = {rate}")
+        logger.debug("Exchange rate fetched: %s/%s = %s", source, target, rate)
 
-        getcontext().prec = 10
-        result = float(Decimal(str(rate)) * Decimal(str(volume)))
+        result = round(rate * volume, 6)
 
-        logger.info(f"Conversion successful: {volume} {source} = {result} {target}")
+        logger.info("Conversion successful: %s %s = %s %s", volume, source, result, target)
         return ConversionResponse(result=result)
     except HTTPException as e:
-        logger.error(f"Conversion failed: {e.detail}")
+        logger.error("Conversion failed: %s", e.detail)
         raise
     except Exception as e:
-        logger.exception(f"Unexpected error during conversion: {str(e)}")
+        logger.exception("Unexpected error during conversion: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -66,7 +81,7 @@ async def convert_currency(
 async def get_cache_stats():
     """Get cache statistics."""
     stats = forex_cache.get_stats()
-    logger.debug(f"Cache stats requested: {stats}")
+    logger.debug("Cache stats requested: %s", stats)
     return stats
 
 
@@ -1,4 +1,10 @@
-from pydantic import BaseModel, Field
+from typing import Annotated
+
+from pydantic import BaseModel, Field, StringConstraints
+
+# Six letters, upper-cased during validation. The pattern is checked before
+# to_upper is applied, so it also has to accept lower case (e.g. "eurusd").
+CurrencyPair = Annotated[str, StringConstraints(pattern=r'^[A-Za-z]{6}$', to_upper=True)]
 
 
 class ConversionResponse(BaseModel):
@@ -1,44 +1,173 @@
-import json
 import os
 import base64
+import mmap
+import shutil
+import struct
+
+import orjson
+from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.fernet import Fernet
 from typing import Dict, Optional
 
+# File layout (version 4):
+#   magic(3) | version(1) | algorithm(1) | scrypt log2(n)(1) | r(1) | p(1) | salt(16) | nonce(12) | ciphertext
+# The header (everything before the nonce) is authenticated as associated data.
+# Files in the original format (version 1: no header, salt(16) | Fernet token, with a
+# PBKDF2 key) are still read and rewritten as version 4 on the next flush.
+MAGIC = b"ESS"
+FORMAT_VERSION = 4
+HEADER = struct.Struct("<3sBBBBB16s")
+SALT_SIZE = 16
+NONCE_SIZE = 12
+CHUNK_SIZE = 64 * 1024  # AES-GCM stores are encrypted in chunks of this size
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+ALG_AESGCM = 0x01
+ALG_CHACHA20_POLY1305 = 0x02
+AEADS = {ALG_AESGCM: AESGCM, ALG_CHACHA20_POLY1305: ChaCha20Poly1305}
+
+# scrypt cost: n=2**15, r=8, p=1 (~32 MiB of memory per derivation)
+SCRYPT_LOG2_N = 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# OpenSSL >= 1.1.1 is needed for the SHA-NI / AES-NI code paths the KDF and cipher rely on
+MIN_OPENSSL_VERSION = 0x10101000
+
+KdfParams = Optional[tuple[int, int, int]]  # (log2_n, r, p) for scrypt, None for legacy PBKDF2
+
+
+def cpu_has_aes() -> bool:
+    """True unless /proc/cpuinfo shows a CPU without AES instructions"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpuinfo = f.read()
+    except OSError:
+        return True  # no cpuinfo (macOS, Windows): assume AES-NI / ARMv8 crypto extensions
+    for line in cpuinfo.splitlines():
+        # x86 lists CPU features under "flags", ARM under "Features"
+        name, _, value = line.partition(":")
+        if name.strip() in ("flags", "Features"):
+            return "aes" in value.split()
+    return True
+
+
+def check_openssl_version():
+    version = default_backend().openssl_version_number()
+    if version < MIN_OPENSSL_VERSION:
+        raise RuntimeError(
+            f"EncryptedStoreService needs OpenSSL >= 1.1.1, "
+            f"cryptography is linked against {default_backend().openssl_version_text()}"
+        )
+
+
+check_openssl_version()
+
+# AES-GCM is fastest with hardware AES, ChaCha20-Poly1305 without it
+DEFAULT_ALGORITHM = ALG_AESGCM if cpu_has_aes() else ALG_CHACHA20_POLY1305
+
+
 class EncryptedStoreService:
     def __init__(self, path: str, master_password: str):
         self.path = path
-        self.master_password = master_password
+        self._master_password = master_password
         self._store: Dict[str, str] = {}
         self._opened = False
         self._salt: Optional[bytes] = None
+        self._kdf_params: KdfParams = None
+        # memo of the last derived key; the salt and KDF parameters are kept in the
+        # file, so it stays valid across lock()/load() cycles of the same store
+        self._cached_salt: Optional[bytes] = None
+        self._cached_kdf_params: KdfParams = None
+        self._cached_key: Optional[bytes] = None
 
-    def _derive_key(self, salt: bytes) -> bytes:
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100_000,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(self.master_password.encode("utf-8")))
+    @property
+    def master_password(self) -> str:
+        return self._master_password
+
+    @master_password.setter
+    def master_password(self, value: str):
+        self._master_password = value
+        self._cached_key = None  # derived key no longer matches the password
+
+    def _derive_key(self, salt: bytes, kdf_params: KdfParams) -> bytes:
+        if (salt == self._cached_salt and kdf_params == self._cached_kdf_params
+                and self._cached_key is not None):
+            return self._cached_key
+        if kdf_params is None:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=100_000,
+            )
+        else:
+            log2_n, r, p = kdf_params
+            kdf = Scrypt(salt=salt, length=32, n=2 ** log2_n, r=r, p=p)
+        key = kdf.derive(self.master_password.encode("utf-8"))
+        self._cached_salt, self._cached_kdf_params, self._cached_key = salt, kdf_params, key
+        return key
 
     def load(self):
         if not os.path.exists(self.path):
             # generate new salt for the new file
             print('creating new file')
-            self._salt = os.urandom(16)
+            self._salt = os.urandom(SALT_SIZE)
+            self._kdf_params = (SCRYPT_LOG2_N, SCRYPT_R, SCRYPT_P)
             self._store = {}
             self._opened = True
             return
         with open(self.path, "rb") as f:
-            header = f.read(24)
-            self._salt = header[:16]
-            data = header[16:] + f.read()
-            key = self._derive_key(self._salt)
-            store_json = Fernet(key).decrypt(data).decode("utf-8")
-            self._store = json.loads(store_json)
-            self._opened = True
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # not closed explicitly: on a failed decrypt the traceback still holds views
+        # into the mapping; it is unmapped when the last reference goes away
+        salt, kdf_params, store_json = self._decrypt(memoryview(mm))
+        self._store = orjson.loads(store_json)
+        self._salt = salt
+        # older stores are rewritten in the current format on the next flush
+        self._kdf_params = kdf_params or (SCRYPT_LOG2_N, SCRYPT_R, SCRYPT_P)
+        self._opened = True
+
+    def _decrypt(self, data: memoryview) -> tuple[bytes, KdfParams, bytes]:
+        """Decrypt a mapped store file; returns (salt, kdf params, plaintext)"""
+        # AEAD ciphers take the mapped ciphertext as-is, so it is never copied
+        if data[:len(MAGIC)] == MAGIC:
+            version = data[len(MAGIC)]
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported store format version: {version}")
+            _, _, algorithm, log2_n, r, p, salt = HEADER.unpack_from(data)
+            if algorithm not in AEADS:
+                raise ValueError(f"Unsupported store cipher: {algorithm}")
+            kdf_params = (log2_n, r, p)
+            key = self._derive_key(salt, kdf_params)
+            nonce_end = HEADER.size + NONCE_SIZE
+            plaintext = AEADS[algorithm](key).decrypt(data[HEADER.size:nonce_end], data[nonce_end:], data[:HEADER.size])
+            return salt, kdf_params, plaintext
+        salt = bytes(data[:SALT_SIZE])
+        key = self._derive_key(salt, None)
+        # Fernet only accepts bytes
+        return salt, None, Fernet(base64.urlsafe_b64encode(key)).decrypt(bytes(data[SALT_SIZE:]))
+
+    @staticmethod
+    def _encrypt_aesgcm_stream(f, key: bytes, header: bytes, plaintext: bytes):
+        # encrypt into one reusable 64 KiB buffer instead of a second full-size copy
+        nonce = os.urandom(NONCE_SIZE)
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+        encryptor.authenticate_additional_data(header)
+        f.write(nonce)
+        out = bytearray(CHUNK_SIZE + 15)  # update_into needs block_size - 1 bytes of slack
+        out_view = memoryview(out)
+        data = memoryview(plaintext)
+        for i in range(0, len(data), CHUNK_SIZE):
+            n = encryptor.update_into(data[i:i + CHUNK_SIZE], out)
+            f.write(out_view[:n])
+        f.write(encryptor.finalize())
+        f.write(encryptor.tag)
 
     def list_keys(self):
         if not self._opened:
@@ -55,15 +184,43 @@ class EncryptedStoreService:
             raise RuntimeError("EncryptedStoreService is not loaded")
         self._store[key] = value
 
+    def flush(self):
+        """Encrypt and write the store to disk, keeping it open"""
+        if not self._opened:
+            raise RuntimeError("EncryptedStoreService is not loaded")
+        store_json = orjson.dumps(self._store)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, DEFAULT_ALGORITHM, *self._kdf_params, self._salt)
+        key = self._derive_key(self._salt, self._kdf_params)
+        # write a temporary file and rename it over the store, so a crash mid-write
+        # leaves the previous version intact
+        tmp_path = self.path + ".tmp"
+        try:
+            # owner-only for a new store; an existing store's mode carries over to the replacement
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+            with os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+                if os.path.exists(self.path):
+                    shutil.copymode(self.path, tmp_path)
+                f.write(header)
+                if DEFAULT_ALGORITHM == ALG_AESGCM:
+                    self._encrypt_aesgcm_stream(f, key, header, store_json)
+                else:
+                    # ChaCha20Poly1305 has no incremental API in cryptography
+                    nonce = os.urandom(NONCE_SIZE)
+                    f.write(nonce)
+                    f.write(AEADS[DEFAULT_ALGORITHM](key).encrypt(nonce, store_json, header))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
     def lock(self):
         if not self._opened:
             raise RuntimeError("EncryptedStoreService is not loaded")
-        key = self._derive_key(self._salt if self._salt else os.urandom(16))
-        store_json = json.dumps(self._store).encode("utf-8")
-        encrypted = Fernet(key).encrypt(store_json)
-        with open(self.path, "wb") as f:
-            f.write(self._salt)
-            f.write(encrypted)
+        self.flush()
         self._store = {}
         self._opened = False
         self._salt = None
+        self._kdf_params = None
@@ -2,6 +2,7 @@
 """
 Console-based client for DocumentProcessor
 """
+import base64
 from datetime import datetime
 from pathlib import Path
 from uuid import uuid4
@@ -73,7 +74,7 @@ class DocumentClient:
         print("=" * 50)
 
     def generate_keys(self):
-        """Generate new RSA key pair"""
+        """Generate new key pair"""
         print("\n--- Generate Keys ---")
         try:
             self.processor.generate_keys()
@@ -193,8 +194,8 @@ class DocumentClient:
             print(f"\n✓ Document signed successfully")
             print(f"  Document ID: {signature.document_id}")
             print(f"  Signator ID: {signature.signator_id}")
-            print(f"  Signed at: {signature.signed_at}")
-            print(f"  Signature (first 64 chars): {signature.signature[:64]}...")
+            print(f"  Signed at: {signature.signed_at_datetime}")
+            print(f"  Signature (first 64 chars): {base64.b64encode(signature.signature).decode()[:64]}...")
 
             # Store signature for saving
             self.current_signature = signature
@@ -274,7 +275,7 @@ class DocumentClient:
             print(f"  Addressee: {self.current_document.addressee_id}")
             print(f"  Paragraphs: {len(self.current_document.content)}")
             print(f"  Signator ID: {self.current_signature.signator_id}")
-            print(f"  Signed at: {self.current_signature.signed_at}")
+            print(f"  Signed at: {self.current_signature.signed_at_datetime}")
 
         except Exception as e:
             print(f"✗ Error: {e}")
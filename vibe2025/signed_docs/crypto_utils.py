@@ -1,6 +1,10 @@
+import os
+from functools import lru_cache
+
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa, padding
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
 
 """
 Prompt:
@@ -9,17 +13,32 @@ and verify the signeture; for the signatures create functions to generate keys,
 
 """
 
+# New keys are Ed25519; RSA keys (e.g. generated by key_generation_bash.sh) are still
+# accepted for signing and verification so existing signatures keep working.
+PrivateKey = ed25519.Ed25519PrivateKey | rsa.RSAPrivateKey
+PublicKey = ed25519.Ed25519PublicKey | rsa.RSAPublicKey
 
-def generate_keys() -> rsa.RSAPrivateKey:
-    """Generate RSA private key pair"""
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048
-    )
-    return private_key
+# RSA-PSS parameters; cryptography's hash/padding objects are immutable, so they are built once
+_SHA256 = hashes.SHA256()
+_PREHASHED_SHA256 = Prehashed(_SHA256)
+_PSS = padding.PSS(mgf=padding.MGF1(_SHA256), salt_length=padding.PSS.MAX_LENGTH)
+
+
+def key_algorithm(key: PrivateKey | PublicKey) -> str:
+    """Name of the signature algorithm for a key ("ed25519" or "rsa")"""
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "ed25519"
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "rsa"
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+
+def generate_keys() -> ed25519.Ed25519PrivateKey:
+    """Generate Ed25519 private key"""
+    return ed25519.Ed25519PrivateKey.generate()
 
 
-def save_private_key(private_key: rsa.RSAPrivateKey, filename: str, password: str = None) -> None:
+def save_private_key(private_key: PrivateKey, filename: str, password: str = None) -> None:
     """Save private key to file with optional password protection"""
     encryption = (
         serialization.BestAvailableEncryption(password.encode())
@@ -35,9 +54,10 @@ def save_private_key(private_key: rsa.RSAPrivateKey, filename: str, password: st
 
     with open(filename, 'wb') as f:
         f.write(pem)
+    _load_private_key_cached.cache_clear()
 
 
-def save_public_key(private_key: rsa.RSAPrivateKey, filename: str) -> None:
+def save_public_key(private_key: PrivateKey, filename: str) -> None:
     """Save public key to file"""
     public_key = private_key.public_key()
     pem = public_key.public_bytes(
@@ -47,10 +67,16 @@ def save_public_key(private_key: rsa.RSAPrivateKey, filename: str) -> None:
 
     with open(filename, 'wb') as f:
         f.write(pem)
+    _load_public_key_cached.cache_clear()
 
 
-def load_private_key(filename, password=None) -> rsa.RSAPrivateKey:
-    """Load private key from a file"""
+def _file_stamp(filename) -> tuple[str, int, int, int]:
+    """(path, mtime, size, inode) of a file; changes whenever the file is rewritten or replaced"""
+    st = os.stat(filename)
+    return str(filename), st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _read_private_key(filename, password: str | None) -> PrivateKey:
     with open(filename, 'rb') as f:
         private_key = serialization.load_pem_private_key(
             f.read(),
@@ -59,51 +85,74 @@ def load_private_key(filename, password=None) -> rsa.RSAPrivateKey:
     return private_key
 
 
-def load_public_key(filename: str) -> rsa.RSAPublicKey:
-    """Load public key from file"""
-    with open(filename, 'rb') as f:
+@lru_cache(maxsize=32)
+def _load_private_key_cached(stamp: tuple[str, int, int, int]) -> PrivateKey:
+    return _read_private_key(stamp[0], None)
+
+
+@lru_cache(maxsize=32)
+def _load_public_key_cached(stamp: tuple[str, int, int, int]) -> PublicKey:
+    with open(stamp[0], 'rb') as f:
         public_key = serialization.load_pem_public_key(f.read())
     return public_key
 
 
-def sign_text(text: str, private_key: rsa.RSAPrivateKey) -> bytes:
-    """Sign SHA-256 hash of the text using the private key"""
-    message = text.encode()
+def load_private_key(filename, password=None) -> PrivateKey:
+    """Load private key from a file (unencrypted keys are parsed once per file modification)"""
+    if password:
+        # never cached, so the password is not kept around as a cache key
+        return _read_private_key(filename, password)
+    return _load_private_key_cached(_file_stamp(filename))
 
-    signature = private_key.sign(
-        message,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
 
-    return signature
+def load_public_key(filename: str) -> PublicKey:
+    """Load public key from file (parsed once per file modification)"""
+    return _load_public_key_cached(_file_stamp(filename))
 
 
-def verify_signature(text, signature, public_key) -> bool:
-    """Verify signature of text using public key"""
-    message = text.encode()
+def sign_message(message: bytes, private_key: PrivateKey, digest: bytes | None = None) -> bytes:
+    """
+    Sign message bytes (Ed25519, or RSA-PSS/SHA-256 for legacy RSA keys)
+
+    digest, if given, must be sha256(message); RSA then signs it as Prehashed
+    instead of hashing the message again. Ed25519 always uses the message.
+    """
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        data, algorithm = (message, _SHA256) if digest is None else (digest, _PREHASHED_SHA256)
+        return private_key.sign(data, _PSS, algorithm)
+    # Ed25519 hashes the message internally (SHA-512), no padding/hash arguments
+    return private_key.sign(message)
+
+
+def verify_message(message: bytes, signature, public_key, digest: bytes | None = None) -> bool:
+    """Verify signature of message bytes using public key (digest as in sign_message)"""
     if not isinstance(signature, bytes):
         return False
 
     try:
-        public_key.verify(
-            signature,
-            message,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(signature, message)
+        elif isinstance(public_key, rsa.RSAPublicKey):
+            data, algorithm = (message, _SHA256) if digest is None else (digest, _PREHASHED_SHA256)
+            public_key.verify(signature, data, _PSS, algorithm)
+        else:
+            return False
         return True
     except InvalidSignature:
         return False
     except TypeError:
         return False
 
+
+def sign_text(text: str, private_key: PrivateKey) -> bytes:
+    """Sign the text using the private key"""
+    return sign_message(text.encode(), private_key)
+
+
+def verify_signature(text, signature, public_key) -> bool:
+    """Verify signature of text using public key"""
+    return verify_message(text.encode(), signature, public_key)
+
 # Example usage
 if __name__ == "__main__":
     # Generate and save keys
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI, HTTPException, status
 from pydantic import BaseModel
 
@@ -31,6 +33,10 @@ class VerifyResponse(BaseModel):
     message: str
 
 
+class VerifyBatchResponse(BaseModel):
+    valid: list[bool]
+
+
 class TrustedSignersResponse(BaseModel):
     signer_ids: list[int]
 
@@ -55,7 +61,8 @@ async def add_trusted_key(request: AddKeyRequest):
         # Normalize newlines - handle both literal \n strings and actual newlines
         public_key_pem = request.public_key_pem.replace('\\n', '\n')
 
-        service.add_trusted_key(request.signer_id, public_key_pem)
+        # PEM parsing is CPU work: keep it off the event loop
+        await asyncio.to_thread(service.add_trusted_key, request.signer_id, public_key_pem)
         return AddKeyResponse(
             success=True,
             message=f"Successfully added trusted key for signer {request.signer_id}"
@@ -104,7 +111,10 @@ async def list_trusted_signers():
 async def verify_document_signature(request: VerifyRequest):
     """Verify a document signature"""
     try:
-        is_valid = service.verify_document_signature(request.document, request.signature)
+        # serialization and the signature check are CPU work: keep them off the event loop
+        is_valid = await asyncio.to_thread(
+            service.verify_document_signature, request.document, request.signature
+        )
 
         if is_valid:
             return VerifyResponse(
@@ -123,6 +133,19 @@ async def verify_document_signature(request: VerifyRequest):
         )
 
 
+@app.post("/verify_batch", response_model=VerifyBatchResponse)
+async def verify_document_signatures(requests: list[VerifyRequest]):
+    """Verify many document signatures; results are in request order"""
+    try:
+        pairs = [(request.document, request.signature) for request in requests]
+        return VerifyBatchResponse(valid=await asyncio.to_thread(service.verify_many, pairs))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Verification error: {str(e)}"
+        )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
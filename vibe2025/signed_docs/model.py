@@ -1,15 +1,34 @@
-from datetime import datetime
+import base64
+import hmac
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Literal
 from uuid import UUID
-from pydantic import BaseModel
 
+import orjson
+from pydantic import BaseModel, BeforeValidator, ConfigDict, PlainSerializer, TypeAdapter, field_serializer, \
+    field_validator
+from pydantic.dataclasses import dataclass
 
-class Paragraph(BaseModel):
+
+_DatetimeAdapter = TypeAdapter(datetime)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(slots=True)
+class Paragraph:
+    # a slotted (pydantic) dataclass instead of a BaseModel: validated the same way,
+    # but without a per-instance __dict__ and fields-set bookkeeping
     fixed_text: str
     placeholder: str
     text: str
 
 
 class Document(BaseModel):
+    # Paragraph stays mutable: documents are edited by replacing paragraph text
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     id: UUID
     parent_document_id: UUID | None = None
     author_id: int
@@ -17,11 +36,91 @@ class Document(BaseModel):
     created_at: datetime
     content: list[Paragraph]
 
+    def canonical_json(self) -> bytes:
+        """Canonical JSON used as the signed message.
+
+        For a Document this is the RFC 8785 (JCS) form: keys sorted, no
+        whitespace, UTF-8 output with only the mandatory escapes. Documents
+        have no floats, so JCS number formatting never applies. The golden
+        test in tests/signed_docs pins the exact bytes.
+        """
+        return orjson.dumps(self.model_dump(), option=orjson.OPT_SORT_KEYS)
+
+    def matches_signed_json(self, json_version: bytes, canonical: bytes | None = None) -> bool:
+        """True if json_version is this document as signed (constant-time compares)
+
+        New signatures sign canonical_json(); signatures made before it signed
+        pydantic's model_dump_json() layout, which is still accepted so they
+        keep verifying. canonical may pass an already computed canonical_json().
+        """
+        if canonical is None:
+            canonical = self.canonical_json()
+        if hmac.compare_digest(canonical, json_version):
+            return True
+        return hmac.compare_digest(self.model_dump_json().encode('utf-8'), json_version)
+
+
+SignatureAlgorithm = Literal["rsa", "ed25519"]
+
+_HEX_RE = re.compile(r"(?:[0-9a-fA-F]{2})+")
+
+
+def _decode_signature_bytes(value):
+    # base64 is the current text form; legacy files stored the signature as hex.
+    # Base64 of 64/256-byte signatures always ends in '=', so it never looks like hex.
+    if isinstance(value, str):
+        if _HEX_RE.fullmatch(value):
+            return bytes.fromhex(value)
+        return base64.b64decode(value, validate=True)
+    return value
+
+
+SignatureBytes = Annotated[
+    bytes,
+    BeforeValidator(_decode_signature_bytes),
+    PlainSerializer(lambda value: base64.b64encode(value).decode("ascii"), return_type=str, when_used="json"),
+]
+
 
 class Signature(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     document_id: UUID
-    json_version: str
+    json_version: bytes
     signator_id: int
     public_key: str
-    signature: str
-    signed_at: datetime
+    signature: SignatureBytes
+    # signatures saved before this field existed are all RSA-PSS
+    algorithm: SignatureAlgorithm = "rsa"
+    signed_at: int  # epoch nanoseconds (time.time_ns()); dumped as a datetime
+
+    @field_validator("signed_at", mode="before")
+    @classmethod
+    def _signed_at_to_ns(cls, value):
+        if isinstance(value, str):
+            # pydantic's parser, not datetime.fromisoformat: the serializer writes a
+            # trailing "Z", which fromisoformat only accepts from Python 3.11
+            value = _DatetimeAdapter.validate_python(value)
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.astimezone()  # naive values are local time, as datetime.timestamp() assumes
+            # exact integer arithmetic: no float, and floor (not truncation) before 1970
+            return (value - _EPOCH) // _MICROSECOND * 1_000
+        return value
+
+    @field_serializer("signed_at")
+    def _signed_at_to_datetime(self, value: int) -> datetime:
+        return ns_to_datetime(value)
+
+    @property
+    def signed_at_datetime(self) -> datetime:
+        return ns_to_datetime(self.signed_at)
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Epoch nanoseconds -> aware UTC datetime (microsecond precision)"""
+    return _EPOCH + timedelta(microseconds=ns // 1_000)
+
+
+DocumentAdapter = TypeAdapter(Document)
+SignatureAdapter = TypeAdapter(Signature)
@@ -1,13 +1,17 @@
-import json
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+import orjson
+from cryptography.hazmat.primitives import serialization
 
-from vibe2025.signed_docs.crypto_utils import save_public_key, generate_keys
-from vibe2025.signed_docs.model import Document, Signature, Paragraph
+from vibe2025.signed_docs import crypto_utils
+from vibe2025.signed_docs.model import Document, Signature, Paragraph, DocumentAdapter, SignatureAdapter
 
 """
 Prompt:
@@ -20,19 +24,30 @@ also saving/loading (document,signature) pairs, verifying signatures
 This is a de-facto client for working with Documents and Signatures.
 """
 
+# Max number of (message digest, signature bytes, public key, algorithm) verification results kept per processor
+VERIFY_CACHE_SIZE = 1024
+# Max number of parsed public keys kept per processor
+PUBLIC_KEY_CACHE_SIZE = 128
+
+
 class DocumentProcessor:
     def __init__(self, private_key_path: str = None):
         """Initialize processor with optional private key"""
         self.private_key = None
+        self._public_key_pem: str | None = None
+        # (digest, signature, public key, algorithm) -> result; used from worker threads too
+        self._verified: OrderedDict[tuple[bytes, bytes, str, str], bool] = OrderedDict()
+        self._verified_lock = threading.Lock()
+        # PEM digest -> parsed key; used from verify_signatures_batch worker threads
+        self._pubkey_cache: OrderedDict[bytes, crypto_utils.PublicKey] = OrderedDict()
+        self._pubkey_lock = threading.Lock()
         if private_key_path and Path(private_key_path).exists():
             self.load_private_key(private_key_path)
 
     def generate_keys(self):
-        """Generate new RSA key pair"""
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048
-        )
+        """Generate new Ed25519 key pair"""
+        self.private_key = crypto_utils.generate_keys()
+        self._public_key_pem = None
         return self.private_key
 
     def save_private_key(self, filename: str, password: str = None):
@@ -40,27 +55,12 @@ class DocumentProcessor:
         if not self.private_key:
             raise ValueError("No private key to save")
 
-        encryption = (
-            serialization.BestAvailableEncryption(password.encode())
-            if password
-            else serialization.NoEncryption()
-        )
-
-        pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=encryption
-        )
-
-        Path(filename).write_bytes(pem)
+        crypto_utils.save_private_key(self.private_key, filename, password)
 
     def load_private_key(self, filename: str, password: str = None):
         """Load private key from file"""
-        pem_data = Path(filename).read_bytes()
-        self.private_key = serialization.load_pem_private_key(
-            pem_data,
-            password=password.encode() if password else None
-        )
+        self.private_key = crypto_utils.load_private_key(filename, password)
+        self._public_key_pem = None
         return self.private_key
 
     def get_public_key_pem(self) -> str:
@@ -68,94 +68,194 @@ class DocumentProcessor:
         if not self.private_key:
             raise ValueError("No private key available")
 
-        public_key = self.private_key.public_key()
-        pem = public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        return pem.decode('utf-8')
+        if self._public_key_pem is None:
+            public_key = self.private_key.public_key()
+            pem = public_key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+            self._public_key_pem = pem.decode('utf-8')
+        return self._public_key_pem
 
-    def _document_to_canonical_json(self, document: Document) -> str:
+    def _document_to_canonical_json(self, document: Document) -> bytes:
         """Convert the document to canonical JSON for signing"""
-        return document.model_dump_json(indent=None)
+        return document.canonical_json()
+
+    def _remember_verification(self, key: tuple[bytes, bytes, str, str], result: bool) -> None:
+        """Store a verification result, evicting the least recently used one when full"""
+        with self._verified_lock:
+            self._verified[key] = result
+            self._verified.move_to_end(key)
+            if len(self._verified) > VERIFY_CACHE_SIZE:
+                self._verified.popitem(last=False)
 
     def sign_document(self, document: Document, signator_id: int) -> Signature:
         """Create signature for a document"""
         if not self.private_key:
             raise ValueError("No private key loaded")
 
-        # Get canonical JSON representation
+        # Get canonical JSON representation; its digest is computed once and
+        # shared by RSA (prehashed signing) and the verification cache
         json_version = self._document_to_canonical_json(document)
-        message = json_version.encode('utf-8')
+        digest = hashlib.sha256(json_version).digest()
 
         # Sign the document
-        signature_bytes = self.private_key.sign(
-            message,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        signature_bytes = crypto_utils.sign_message(json_version, self.private_key, digest)
 
-        return Signature(
+        signature = Signature(
             document_id=document.id,
             json_version=json_version,
             signator_id=signator_id,
             public_key=self.get_public_key_pem(),
-            signature=signature_bytes.hex(),
-            signed_at=datetime.now()
+            signature=signature_bytes,
+            algorithm=crypto_utils.key_algorithm(self.private_key),
+            signed_at=time.time_ns()
         )
 
+        # A signature we just produced is known to be valid
+        cache_key = (digest, signature.signature, signature.public_key, signature.algorithm)
+        self._remember_verification(cache_key, True)
+        return signature
+
+    def _precheck_signature(self, document: Document, signature: Signature) -> tuple[bool | None, tuple]:
+        """
+        Run the cheap checks for a (document, signature) pair
+
+        Returns (result, cache_key); result is None when the public-key check still has to run
+        """
+        # Check document ID matches
+        if document.id != signature.document_id:
+            return False, ()
+
+        return self._precheck_json_bytes(self._document_to_canonical_json(document), signature, document)
+
+    def _precheck_json_bytes(
+            self, json_bytes: bytes, signature: Signature, document: Document | None = None
+    ) -> tuple[bool | None, tuple]:
+        """Like _precheck_signature, for an already serialized canonical JSON"""
+        # Verify it matches the stored version (constant-time compare)
+        if not hmac.compare_digest(json_bytes, signature.json_version):
+            # may still be a signature over the pre-canonical_json layout
+            if document is None:
+                document = DocumentAdapter.validate_json(json_bytes)
+            if not document.matches_signed_json(signature.json_version, json_bytes):
+                return False, ()
+
+        # The crypto check depends only on (message, signature, public key, algorithm)
+        digest = hashlib.sha256(signature.json_version).digest()
+        cache_key = (digest, signature.signature, signature.public_key, signature.algorithm)
+        with self._verified_lock:
+            cached = self._verified.get(cache_key)
+            if cached is not None:
+                self._verified.move_to_end(cache_key)
+        return cached, cache_key
+
+    def _load_public_key(self, pem: str) -> crypto_utils.PublicKey:
+        """Parse a PEM public key, reusing the parsed object for recently seen keys"""
+        pem_bytes = pem.encode('utf-8')
+        cache_key = hashlib.blake2b(pem_bytes, digest_size=16).digest()
+        with self._pubkey_lock:
+            public_key = self._pubkey_cache.get(cache_key)
+            if public_key is not None:
+                self._pubkey_cache.move_to_end(cache_key)
+                return public_key
+
+        public_key = serialization.load_pem_public_key(pem_bytes)
+        with self._pubkey_lock:
+            self._pubkey_cache[cache_key] = public_key
+            if len(self._pubkey_cache) > PUBLIC_KEY_CACHE_SIZE:
+                self._pubkey_cache.popitem(last=False)
+        return public_key
+
+    def _verify_signature_bytes(self, signature: Signature, digest: bytes | None = None) -> bool:
+        """Check the signature over json_version (sha256 digest optional) with the public key it carries"""
+        try:
+            public_key = self._load_public_key(signature.public_key)
+            # the declared algorithm must match the key, no cross-algorithm fallback
+            if crypto_utils.key_algorithm(public_key) != signature.algorithm:
+                return False
+            return crypto_utils.verify_message(signature.json_version, signature.signature, public_key, digest)
+        except Exception:
+            return False
+
     def verify_signature(self, document: Document, signature: Signature) -> bool:
         """Verify a signature against a document"""
         try:
             # Check document ID matches
             if document.id != signature.document_id:
                 return False
+            return self._verify_json_bytes(self._document_to_canonical_json(document), signature, document)
+        except Exception:
+            return False
 
-            # Load public key from signature
-            public_key = serialization.load_pem_public_key(
-                signature.public_key.encode('utf-8')
-            )
+    def verify_signature_bytes(self, json_bytes: bytes, signature: Signature) -> bool:
+        """
+        Verify a signature against canonical JSON the caller already has
 
-            # Get canonical JSON and verify it matches stored version
-            current_json = self._document_to_canonical_json(document)
-            if current_json != signature.json_version:
-                return False
+        Skips serializing the document; json_bytes must be Document.canonical_json()
+        of the document being checked.
+        """
+        return self._verify_json_bytes(json_bytes, signature)
 
-            # Verify the signature
-            message = signature.json_version.encode('utf-8')
-            signature_bytes = bytes.fromhex(signature.signature)
-
-            public_key.verify(
-                signature_bytes,
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            return True
-        except InvalidSignature:
-            return False
+    def _verify_json_bytes(self, json_bytes: bytes, signature: Signature, document: Document | None = None) -> bool:
+        try:
+            is_valid, cache_key = self._precheck_json_bytes(json_bytes, signature, document)
+            if is_valid is None:
+                is_valid = self._verify_signature_bytes(signature, cache_key[0])
+                self._remember_verification(cache_key, is_valid)
+            return is_valid
         except Exception:
             return False
 
+    def verify_signatures_batch(self, pairs: list[tuple[Document, Signature]]) -> list[bool]:
+        """
+        Verify many (document, signature) pairs at once
+
+        Serialization and cache lookups run in the calling thread; the remaining
+        public-key checks are spread over a thread pool.
+
+        Returns:
+            One result per pair, in input order
+        """
+        results: list[bool | None] = []
+        pending: dict[tuple, list[int]] = {}  # cache key -> indices waiting for that check
+        signatures: dict[tuple, Signature] = {}
+        for index, (document, signature) in enumerate(pairs):
+            try:
+                is_valid, cache_key = self._precheck_signature(document, signature)
+            except Exception:
+                is_valid, cache_key = False, ()
+            results.append(is_valid)
+            if is_valid is None:
+                pending.setdefault(cache_key, []).append(index)
+                signatures[cache_key] = signature
+
+        if pending:
+            keys = list(pending)
+            with ThreadPoolExecutor() as executor:
+                outcomes = executor.map(
+                    self._verify_signature_bytes, [signatures[key] for key in keys], [key[0] for key in keys]
+                )
+                for cache_key, is_valid in zip(keys, outcomes):
+                    self._remember_verification(cache_key, is_valid)
+                    for index in pending[cache_key]:
+                        results[index] = is_valid
+
+        return results
+
     def save_document_signature_pair(self, document: Document, signature: Signature, filename: str):
         """Save document and signature to JSON file"""
         data = {
-            "document": json.loads(document.model_dump_json()),
-            "signature": json.loads(signature.model_dump_json())
+            "document": document.model_dump(mode="json"),
+            "signature": signature.model_dump(mode="json")
         }
-        Path(filename).write_text(json.dumps(data, indent=2, default=str))
+        Path(filename).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     def load_document_signature_pair(self, filename: str) -> tuple[Document, Signature]:
         """Load document and signature from JSON file"""
-        data = json.loads(Path(filename).read_text())
-        document = Document(**data["document"])
-        signature = Signature(**data["signature"])
+        data = orjson.loads(Path(filename).read_bytes())
+        document = DocumentAdapter.validate_python(data["document"])
+        signature = SignatureAdapter.validate_python(data["signature"])
         return document, signature
 
 
@@ -1,7 +1,11 @@
-from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from cryptography.hazmat.primitives import serialization
+
+from vibe2025.signed_docs.crypto_utils import PublicKey, key_algorithm, verify_message
 from vibe2025.signed_docs.model import Document, Signature
 
 
@@ -10,7 +14,9 @@ class SignedDocumentsService:
 
     def __init__(self):
         """Initialize with empty trusted keys dictionary"""
-        self.trusted_keys: dict[int, str] = {}
+        # signer id -> (PEM, SHA-256 fingerprint of the PEM, parsed key);
+        # keys are parsed and fingerprinted once, when they are added
+        self.trusted_keys: dict[int, tuple[str, bytes, PublicKey]] = {}
 
     def add_trusted_key(self, signer_id: int, public_key_pem: str) -> None:
         """
@@ -25,11 +31,12 @@ class SignedDocumentsService:
         """
         # Validate the key can be loaded
         try:
-            serialization.load_pem_public_key(public_key_pem.encode('utf-8'))
+            public_key = serialization.load_pem_public_key(public_key_pem.encode('utf-8'))
         except Exception as e:
             raise ValueError(f"Invalid public key format: {e}")
 
-        self.trusted_keys[signer_id] = public_key_pem
+        fingerprint = hashlib.sha256(public_key_pem.encode('utf-8')).digest()
+        self.trusted_keys[signer_id] = (public_key_pem, fingerprint, public_key)
 
     def remove_trusted_key(self, signer_id: int) -> bool:
         """
@@ -48,12 +55,57 @@ class SignedDocumentsService:
 
     def get_trusted_key(self, signer_id: int) -> str | None:
         """Get trusted public key for a signer"""
-        return self.trusted_keys.get(signer_id)
+        trusted = self.trusted_keys.get(signer_id)
+        return trusted[0] if trusted else None
 
     def list_trusted_signers(self) -> list[int]:
         """Get list of all trusted signer IDs"""
         return list(self.trusted_keys.keys())
 
+    def _trusted_key_for(
+            self, document: Document, signature: Signature, current_json: bytes | None = None
+    ) -> PublicKey | None:
+        """
+        Run the checks that need no cryptography
+
+        Args:
+            document: The document to verify
+            signature: The signature to check
+            current_json: The document's canonical JSON, if already computed
+
+        Returns:
+            The trusted public key to verify with, or None if the pair is already rejected
+        """
+        # Check if signer is trusted
+        if signature.signator_id not in self.trusted_keys:
+            return None
+
+        # Check document ID matches
+        if document.id != signature.document_id:
+            return None
+
+        # Get trusted public key
+        _, trusted_fingerprint, public_key = self.trusted_keys[signature.signator_id]
+
+        # Verify the signature's public key matches trusted key (constant-time, on fingerprints)
+        fingerprint = hashlib.sha256(signature.public_key.encode('utf-8')).digest()
+        if not hmac.compare_digest(fingerprint, trusted_fingerprint):
+            return None
+
+        # Check the signed JSON (cheaper than parsing the key, constant-time compare)
+        if not document.matches_signed_json(signature.json_version, current_json):
+            return None
+
+        return public_key
+
+    @staticmethod
+    def _verify_with_key(signature: Signature, public_key, digest: bytes | None = None) -> bool:
+        """Check the cryptographic signature with an already parsed public key (optional sha256 digest)"""
+        # The declared algorithm must match the trusted key
+        if key_algorithm(public_key) != signature.algorithm:
+            return False
+        return verify_message(signature.json_version, signature.signature, public_key, digest)
+
     def verify_document_signature(self, document: Document, signature: Signature) -> bool:
         """
         Verify a document signature using trusted public keys
@@ -66,51 +118,113 @@ class SignedDocumentsService:
             True if signature is valid and from a trusted signer, False otherwise
         """
         try:
-            # Check if signer is trusted
-            if signature.signator_id not in self.trusted_keys:
+            public_key = self._trusted_key_for(document, signature)
+            if public_key is None:
                 return False
 
-            # Check document ID matches
-            if document.id != signature.document_id:
-                return False
+            # Verify the cryptographic signature
+            return self._verify_with_key(signature, public_key)
 
-            # Get trusted public key
-            trusted_key_pem = self.trusted_keys[signature.signator_id]
+        except Exception:
+            return False
 
-            # Verify the signature's public key matches trusted key
-            if signature.public_key != trusted_key_pem:
-                return False
+    def verify_many(self, pairs: list[tuple[Document, Signature]]) -> list[bool]:
+        """
+        Verify many document signatures at once
 
-            # Load public key
-            public_key = serialization.load_pem_public_key(
-                trusted_key_pem.encode('utf-8')
-            )
+        The signature checks run in a thread pool (cryptography releases the GIL
+        while verifying).
 
-            # Get canonical JSON
-            current_json = document.model_dump_json(indent=None)
-            if current_json != signature.json_version:
-                return False
+        Args:
+            pairs: (document, signature) pairs to verify
 
-            # Verify the cryptographic signature
-            message = signature.json_version.encode('utf-8')
-            signature_bytes = bytes.fromhex(signature.signature)
-
-            public_key.verify(
-                signature_bytes,
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
+        Returns:
+            One result per pair, in input order
+        """
+        results = [False] * len(pairs)
+        jobs = []  # (index, signature, public key, digest)
+        # RSA verifies a prehashed digest, so a document signed by many signers is hashed once
+        digests: dict[bytes, bytes] = {}
+        for index, (document, signature) in enumerate(pairs):
+            try:
+                public_key = self._trusted_key_for(document, signature)
+                if public_key is None:
+                    continue
+                digest = None
+                if key_algorithm(public_key) == "rsa":
+                    digest = digests.get(signature.json_version)
+                    if digest is None:
+                        digest = digests[signature.json_version] = hashlib.sha256(signature.json_version).digest()
+                jobs.append((index, signature, public_key, digest))
+            except Exception:
+                continue
+        self._run_verify_jobs(jobs, results)
+        return results
+
+    def verify_batch_same_doc(self, document: Document, signatures: list[Signature]) -> list[bool]:
+        """
+        Verify many signatures over one document (e.g. a multi-party agreement)
+
+        The document is serialized and hashed once for all signatures; the
+        signature checks run in a thread pool like in verify_many.
+
+        Args:
+            document: The document every signature should be over
+            signatures: Signatures to check
+
+        Returns:
+            One result per signature, in input order
+        """
+        results = [False] * len(signatures)
+        current_json = document.canonical_json()
+        digest = hashlib.sha256(current_json).digest()
+        jobs = []  # (index, signature, public key, digest)
+        for index, signature in enumerate(signatures):
+            try:
+                public_key = self._trusted_key_for(document, signature, current_json)
+                if public_key is None:
+                    continue
+                # the digest covers json_version unless it is the pre-canonical_json layout
+                prehashed = key_algorithm(public_key) == "rsa" and signature.json_version == current_json
+                jobs.append((index, signature, public_key, digest if prehashed else None))
+            except Exception:
+                continue
+        self._run_verify_jobs(jobs, results)
+        return results
+
+    def _run_verify_jobs(self, jobs: list[tuple[int, Signature, PublicKey, bytes | None]], results: list[bool]) -> None:
+        """Run (index, signature, public key, digest) checks in a thread pool, storing outcomes in results"""
+        if not jobs:
+            return
+        with ThreadPoolExecutor() as executor:
+            outcomes = executor.map(
+                self._verify_with_key, [job[1] for job in jobs], [job[2] for job in jobs], [job[3] for job in jobs]
             )
+            for (index, _, _, _), is_valid in zip(jobs, outcomes):
+                results[index] = is_valid
 
-            return True
+    def verify_documents(self, pairs: list[tuple[Document, Signature]]) -> bool:
+        """
+        Check that every document signature is valid
 
-        except InvalidSignature:
-            return False
-        except Exception:
-            return False
+        Verifications run in a thread pool; the first failure cancels the checks
+        that have not started yet.
+
+        Args:
+            pairs: (document, signature) pairs to verify
+
+        Returns:
+            True if all signatures are valid and from trusted signers (also for no pairs)
+        """
+        executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        try:
+            futures = [executor.submit(self.verify_document_signature, *pair) for pair in pairs]
+            for future in as_completed(futures):
+                if not future.result():
+                    return False
+            return True
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 # Example usage
@@ -1,12 +1,17 @@
-from time import sleep
+from time import sleep, time
 
 import pyotp
 
 if __name__ == '__main__':
     secret = pyotp.random_base32()
     print(secret)   # secret to be shared between parties
+    totp = pyotp.TOTP(secret)   # parses the secret once, not on every iteration
+    window, code = None, None
     while True:
-        totp = pyotp.TOTP(secret)
+        # the code only changes once per interval (30s), so it is computed once per window
+        current_window = int(time()) // totp.interval
+        if current_window != window:
+            window, code = current_window, totp.at(current_window * totp.interval)
         # OTP to be passed from one party to the other (ensuring they know the secret)
-        print(totp.now())
-        sleep(2)
\ No newline at end of file
+        print(code)
+        sleep(2)
@@ -1,9 +1,101 @@
-import json
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Iterator, List
+
+import ijson
+import orjson
 from vibe2025.uptime_checker.models import CheckResult
 
+STATUSES = ("available", "unavailable", "error")
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE = -2 ** 31  # utc_offsets value of a naive timestamp
+
+
+def _to_seconds(dt: datetime) -> float:
+    """Seconds since 1970-01-01 in the datetime's own clock (naive stays naive, no local-time conversion)"""
+    return (dt - (_EPOCH_UTC if dt.tzinfo else _EPOCH)).total_seconds()
+
+
+@dataclass
+class ResultsTable:
+    """Check results stored column-wise (one typed array per field) instead of one model per row."""
+    hosts: list[str] = field(default_factory=list)  # interned, so equal hosts share one object
+    ports: array = field(default_factory=lambda: array('i'))
+    statuses: array = field(default_factory=lambda: array('b'))  # index into STATUSES
+    timestamps: array = field(default_factory=lambda: array('d'))  # see _to_seconds
+    utc_offsets: array = field(default_factory=lambda: array('i'))  # seconds, _NAIVE for naive timestamps
+    response_times: array = field(default_factory=lambda: array('d'))  # NaN when missing
+    error_messages: list[str | None] = field(default_factory=list)
+    # (host, port) -> (row timestamps in ascending order, row indices in the same order);
+    # built on the first query and dropped on append
+    _index: dict[tuple[str, int], tuple[array, array]] | None = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ports)
+
+    def append(self, host: str, port: int, status: str, timestamp: datetime,
+               error_message: str | None = None, response_time_ms: float | None = None):
+        """Append one check result."""
+        if status not in _STATUS_CODES:
+            raise ValueError(f"Invalid status: {status!r}")
+        self.hosts.append(sys.intern(host))
+        self.ports.append(port)
+        self.statuses.append(_STATUS_CODES[status])
+        self.timestamps.append(_to_seconds(timestamp))
+        offset = timestamp.utcoffset()
+        self.utc_offsets.append(_NAIVE if offset is None else int(offset.total_seconds()))
+        self.response_times.append(math.nan if response_time_ms is None else response_time_ms)
+        self.error_messages.append(error_message)
+        self._index = None
+
+    def service_rows(self, host: str, port: int) -> tuple[array, array]:
+        """Timestamps (ascending) and row indices of one service's results."""
+        if self._index is None:
+            groups: dict[tuple[str, int], list[int]] = {}
+            for row, key in enumerate(zip(self.hosts, self.ports)):
+                groups.setdefault(key, []).append(row)
+            timestamps = self.timestamps
+            self._index = {}
+            for key, rows in groups.items():
+                rows.sort(key=timestamps.__getitem__)  # linear when the log is already in time order
+                self._index[key] = (array('d', [timestamps[row] for row in rows]), array('i', rows))
+        return self._index.get((host, port), (array('d'), array('i')))
+
+    @classmethod
+    def from_check_results(cls, results: List[CheckResult]) -> "ResultsTable":
+        """Build a table from CheckResult models."""
+        table = cls()
+        for r in results:
+            table.append(r.host, r.port, r.status, r.timestamp, r.error_message, r.response_time_ms)
+        return table
+
+    def timestamp_at(self, index: int) -> datetime:
+        """Timestamp of the row at index, naive or in its original UTC offset."""
+        seconds, offset = timedelta(seconds=self.timestamps[index]), self.utc_offsets[index]
+        if offset == _NAIVE:
+            return _EPOCH + seconds
+        return (_EPOCH_UTC + seconds).astimezone(timezone(timedelta(seconds=offset)))
+
+    def to_check_result(self, index: int) -> CheckResult:
+        """Row at index as a CheckResult model."""
+        response_time = self.response_times[index]
+        return CheckResult(
+            host=self.hosts[index],
+            port=self.ports[index],
+            status=STATUSES[self.statuses[index]],
+            timestamp=self.timestamp_at(index),
+            error_message=self.error_messages[index],
+            response_time_ms=None if math.isnan(response_time) else response_time
+        )
+
 
 class UptimeBrowser:
     """Browser for analyzing uptime data from results file."""
@@ -12,32 +104,49 @@ class UptimeBrowser:
         """Initialize browser with results file path."""
         self.results_file = Path(results_file)
 
-    def load_all_results(self) -> List[CheckResult]:
-        """Load all historical results from JSON file."""
+    def load_all_results(self) -> ResultsTable:
+        """Load all historical results from the results log."""
         if not self.results_file.exists():
             raise FileNotFoundError(f"Results file not found: {self.results_file}")
 
-        all_results = []
-
-        # Note: This assumes results.json is continuously appended or you keep history
-        # For simplicity, we'll read the current snapshot
-        with open(self.results_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Parse results
-        for result_data in data.get("results", []):
-            result = CheckResult(**result_data)
-            all_results.append(result)
+        all_results = ResultsTable()
+
+        # Records are streamed one at a time straight into the columns, so neither the
+        # whole dict tree nor a model per row is ever held in memory
+        with open(self.results_file, 'rb') as f:
+            for result_data in self._iter_records(f):
+                all_results.append(
+                    result_data["host"],
+                    int(result_data["port"]),
+                    result_data["status"],
+                    datetime.fromisoformat(result_data["timestamp"]),
+                    result_data.get("error_message"),
+                    result_data.get("response_time_ms")
+                )
 
         return all_results
 
+    @staticmethod
+    def _iter_records(f: BinaryIO) -> Iterator[dict]:
+        """Yield check result records from a results log (one MonitorResults JSON per line)."""
+        first_line = f.readline()
+        if first_line.strip() == b"{":
+            # indented snapshot written by older versions of the monitor, possibly
+            # followed by the lines appended since; read it as a stream of JSON values
+            f.seek(0)
+            yield from ijson.items(f, "results.item", use_float=True, multiple_values=True)
+            return
+        for line in chain((first_line,), f):
+            if line.strip():
+                yield from orjson.loads(line)["results"]
+
     def calculate_uptime(
             self,
             host: str,
             port: int,
             from_datetime: datetime,
             to_datetime: datetime,
-            results: List[CheckResult]
+            results: List[CheckResult] | ResultsTable
     ) -> dict:
         """
         Calculate uptime statistics for a specific service in a time range.
@@ -47,20 +156,35 @@ class UptimeBrowser:
             port: Service port
             from_datetime: Start of time range
             to_datetime: End of time range
-            results: List of all check results
+            results: All check results, as loaded by load_all_results or a list of CheckResult
+                (a list is converted to a ResultsTable on every call; convert it once
+                with ResultsTable.from_check_results when querying it repeatedly)
 
         Returns:
             Dictionary with uptime statistics
         """
-        # Filter results for this service and time range
-        filtered = [
-            r for r in results
-            if r.host == host
-               and r.port == port
-               and from_datetime <= r.timestamp <= to_datetime
-        ]
-
-        if not filtered:
+        if not isinstance(results, ResultsTable):
+            results = ResultsTable.from_check_results(results)
+
+        # Binary search the service's time-ordered rows, then aggregate only the ones in range
+        timestamps, rows = results.service_rows(host, port)
+        low = bisect_left(timestamps, _to_seconds(from_datetime))
+        high = bisect_right(timestamps, _to_seconds(to_datetime))
+        statuses, response_times = results.statuses, results.response_times
+        counts = [0] * len(STATUSES)
+        response_time_sum = 0.0
+        response_time_count = 0
+        for row in rows[low:high]:
+            counts[statuses[row]] += 1
+            r_response = response_times[row]
+            if r_response == r_response:  # not NaN
+                response_time_sum += r_response
+                response_time_count += 1
+
+        available, unavailable, error = counts
+        total = available + unavailable + error
+
+        if not total:
             return {
                 "host": host,
                 "port": port,
@@ -74,18 +198,11 @@ class UptimeBrowser:
                 "avg_response_time_ms": None
             }
 
-        # Count statuses
-        available = sum(1 for r in filtered if r.status == "available")
-        unavailable = sum(1 for r in filtered if r.status == "unavailable")
-        error = sum(1 for r in filtered if r.status == "error")
-        total = len(filtered)
-
         # Calculate uptime percentage
         uptime_pct = (available / total * 100) if total > 0 else 0.0
 
         # Calculate average response time
-        response_times = [r.response_time_ms for r in filtered if r.response_time_ms is not None]
-        avg_response = sum(response_times) / len(response_times) if response_times else None
+        avg_response = response_time_sum / response_time_count if response_time_count else None
 
         return {
             "host": host,
@@ -4,6 +4,46 @@ import time
 from datetime import datetime
 from vibe2025.uptime_checker.models import CheckResult
 
+# upper bound on connections open at once, well below the usual 1024 file descriptor limit
+MAX_CONCURRENT_CHECKS = 512
+
+# resolved addresses are reused for this long, so repeated checks skip getaddrinfo
+DNS_CACHE_TTL_SECONDS = 300.0
+_dns_cache: dict[tuple[str, int], tuple[list[tuple], float]] = {}
+
+
+async def _resolve(host: str, port: int) -> list[tuple]:
+    """All getaddrinfo entries for (host, port), cached for DNS_CACHE_TTL_SECONDS."""
+    now = time.monotonic()
+    cached = _dns_cache.get((host, port))
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    loop = asyncio.get_running_loop()
+    addrinfos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    _dns_cache[(host, port)] = (addrinfos, now + DNS_CACHE_TTL_SECONDS)
+    return addrinfos
+
+
+async def _tcp_connect(host: str, port: int):
+    """Open and close a plain TCP connection, without a stream transport/protocol around it.
+
+    Resolved addresses are tried in order (e.g. IPv6 then IPv4) until one accepts;
+    if none does, the last connection error is raised.
+    """
+    loop = asyncio.get_running_loop()
+    last_error: OSError | None = None
+    for family, type_, proto, _, address in await _resolve(host, port):
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.setblocking(False)
+            await loop.sock_connect(sock, address)
+            return
+        except OSError as e:
+            last_error = e
+        finally:
+            sock.close()
+    raise last_error or OSError(f"No addresses found for {host}:{port}")
+
 
 async def check_service_availability(
         host: str,
@@ -25,15 +65,12 @@ async def check_service_availability(
 
     try:
         # Use asyncio.wait_for to enforce timeout
-        reader, writer = await asyncio.wait_for(
-            asyncio.open_connection(host, port),
+        await asyncio.wait_for(
+            _tcp_connect(host, port),
             timeout=timeout
         )
 
         # Connection successful
-        writer.close()
-        await writer.wait_closed()
-
         elapsed_ms = (time.perf_counter() - start_time) * 1000
 
         return CheckResult(
@@ -65,7 +102,8 @@ async def check_service_availability(
 
 async def check_all_services(
         services: list[tuple[str, int]],
-        timeout: float
+        timeout: float,
+        max_concurrent: int = MAX_CONCURRENT_CHECKS
 ) -> list[CheckResult]:
     """
     Check availability of all services concurrently.
@@ -73,12 +111,19 @@ async def check_all_services(
     Args:
         services: List of (host, port) tuples
         timeout: Connection timeout in seconds
+        max_concurrent: Maximum number of checks running at the same time
 
     Returns:
         List of CheckResult objects
     """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def bounded_check(host: str, port: int) -> CheckResult:
+        async with semaphore:
+            return await check_service_availability(host, port, timeout)
+
     tasks = [
-        check_service_availability(host, port, timeout)
+        bounded_check(host, port)
         for host, port in services
     ]
 
@@ -1,6 +1,7 @@
-import json
 from pathlib import Path
 from typing import Any
+
+import orjson
 from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -29,7 +30,7 @@ class AppConfig(BaseSettings):
     )
     results_file: str = Field(
         default="results.json",
-        description="Path to results output JSON file"
+        description="Path to the results log (JSON Lines, one check cycle per line)"
     )
 
     _services_config_path: Path | None = PrivateAttr(default=None)
@@ -47,8 +48,7 @@ class AppConfig(BaseSettings):
         if not config_path.exists():
             raise FileNotFoundError(f"Services config file not found: {config_path}")
 
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = orjson.loads(config_path.read_bytes())
 
         services = data.get("services", [])
         return [(svc["host"], svc["port"]) for svc in services]
@@ -1,10 +1,36 @@
 import asyncio
-import json
 from pathlib import Path
 from datetime import datetime
+
+import orjson
 from vibe2025.uptime_checker.config import AppConfig
 from vibe2025.uptime_checker.checker import check_all_services
-from vibe2025.uptime_checker.models import MonitorResults
+from vibe2025.uptime_checker.models import CheckResult
+
+
+def append_results(results_path: Path, check_timestamp: datetime, results: list[CheckResult]):
+    """Append one check cycle to the results log, as a single JSON line."""
+    # Same layout as MonitorResults; built as plain dicts (orjson writes the
+    # datetimes) so serialization skips Pydantic
+    payload = {
+        "check_timestamp": check_timestamp,
+        "results": [
+            {
+                "host": r.host,
+                "port": r.port,
+                "status": r.status,
+                "timestamp": r.timestamp,
+                "error_message": r.error_message,
+                "response_time_ms": r.response_time_ms
+            }
+            for r in results
+        ]
+    }
+
+    # One JSON document per line, so each cycle writes only its own results
+    # instead of rewriting the whole history
+    with open(results_path, 'ab') as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE))
 
 
 async def monitor_services(config: AppConfig):
@@ -25,16 +51,9 @@ async def monitor_services(config: AppConfig):
             config.connection_timeout_seconds
         )
 
-        # Create results container
-        monitor_results = MonitorResults(
-            check_timestamp=datetime.now(),
-            results=results
-        )
-
-        # Save to JSON file
+        # Append to the results log
         results_path = Path(config.results_file)
-        with open(results_path, 'w', encoding='utf-8') as f:
-            f.write(monitor_results.model_dump_json(indent=2))
+        append_results(results_path, datetime.now(), results)
 
         # Print summary
         available = sum(1 for r in results if r.status == "available")
@@ -10,13 +10,13 @@ def main():
     latitude = 49.8224
     longitude = 19.0469
 
-    service = OpenMeteoService(timeout=30.0)
     n_days = 5
     print(f"Fetching {n_days}-day weather forecast for Bielsko-Biała, Poland...")
     print(f"Coordinates: {latitude}°N, {longitude}°E\n")
 
     try:
-        forecasts = service.get_forecast(latitude, longitude, days=n_days)
+        with OpenMeteoService(timeout=30.0) as service:
+            forecasts = service.get_forecast(latitude, longitude, days=n_days)
 
         print("=" * 70)
         print(f"{'Date':<15} {'Min Temp':<12} {'Max Temp':<12} {'Precipitation'}")
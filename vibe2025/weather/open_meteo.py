@@ -1,5 +1,5 @@
 """Open-Meteo weather service implementation."""
-import requests
+import httpx
 from datetime import datetime
 from typing import List
 
@@ -22,7 +22,8 @@ class OpenMeteoService(WeatherService):
         """
         self._timeout = timeout
         self._timezone = timezone
-        self._session = requests.Session()
+        # one pooled HTTP/2 connection, reused (with its TLS session) across calls
+        self._client = httpx.Client(http2=True, timeout=timeout)
 
     def get_forecast(
             self,
@@ -43,7 +44,8 @@ class OpenMeteoService(WeatherService):
 
         Raises:
             ValueError: If coordinates or days are invalid
-            requests.HTTPError: If API request fails
+            TimeoutError: If the API does not answer in time
+            RuntimeError: If API request fails
         """
         if not (-90.0 <= latitude <= 90.0):
             raise ValueError(f"Invalid latitude: {latitude}")
@@ -61,16 +63,15 @@ class OpenMeteoService(WeatherService):
         }
 
         try:
-            response = self._session.get(
+            response = self._client.get(
                 self.BASE_URL,
-                params=params,
-                timeout=self._timeout
+                params=params
             )
             response.raise_for_status()
             data = response.json()
-        except requests.Timeout:
+        except httpx.TimeoutException:
             raise TimeoutError(f"Request timed out after {self._timeout}s")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise RuntimeError(f"API request failed: {e}")
 
         # Parse response
@@ -100,7 +101,12 @@ class OpenMeteoService(WeatherService):
 
         return forecasts
 
-    def __del__(self):
-        """Close the session on cleanup."""
-        if hasattr(self, '_session'):
-            self._session.close()
+    def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        self._client.close()
+
+    def __enter__(self) -> "OpenMeteoService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,18 +1,86 @@
 """Windy.com Point Forecast API service implementation."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import orjson
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from typing import List
 
+from cachetools import TTLCache
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from vibe2025.weather.base import WeatherService
 from vibe2025.weather.model import DayForecast
 
+# One pooled session for all WindyService instances, so repeated forecasts reuse
+# the keep-alive TLS connection to api.windy.com instead of a new handshake per call.
+# Transient errors are retried on the pooled connection; POST is retried too because
+# a Point Forecast request is a pure query (safe to repeat).
+_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["POST"])
+    )
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",  # the hourly float arrays compress well
+    "Content-Type": "application/json",
+}
+_SESSION.headers.update(_HEADERS)
+
+# Optional HTTP/2 transport (WindyService(use_http2=True)): concurrent requests are
+# multiplexed as streams over one TLS connection. Created on first use, shared like _SESSION.
+_HTTP2_CLIENT: httpx.Client | None = None
+_HTTP2_CLIENT_LOCK = threading.Lock()
+
+
+def _get_http2_client() -> httpx.Client:
+    global _HTTP2_CLIENT
+    with _HTTP2_CLIENT_LOCK:
+        if _HTTP2_CLIENT is None:
+            _HTTP2_CLIENT = httpx.Client(
+                http2=True,
+                headers=_HEADERS,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+            )
+        return _HTTP2_CLIENT
+
+
+MAX_FORECAST_WORKERS = 16  # stays below the adapter's pool_maxsize, so no thread waits for a connection
+
+FORECAST_CACHE_SIZE = 1024
+FORECAST_CACHE_TTL_SECONDS = 900  # Windy model runs update every few hours
+
 
 class WindyService(WeatherService):
-    """Weather service using Windy.com Point Forecast API (requires API key)."""
+    """
+    Weather service using Windy.com Point Forecast API (requires API key).
+
+    Use as a context manager (or call close()); after async use, await aclose().
+    """
 
     BASE_URL = "https://api.windy.com/api/point-forecast/v2"
 
-    def __init__(self, api_key: str, model: str = "gfs", timeout: float = 30.0) -> None:
+    def __init__(
+            self,
+            api_key: str,
+            model: str = "gfs",
+            timeout: float = 30.0,
+            include_precip: bool = True,
+            use_http2: bool = False
+    ) -> None:
         """
         Initialize the Windy service.
 
@@ -20,13 +88,70 @@ class WindyService(WeatherService):
             api_key: Windy Point Forecast API key (get at https://api.windy.com/keys)
             model: Weather model (gfs, iconEu, arome, namConus, etc.)
             timeout: Request timeout in seconds
+            include_precip: Request precipitation too; without it precipitation_mm is always 0
+            use_http2: Send requests over HTTP/2 (httpx) instead of HTTP/1.1 (requests)
         """
         if not api_key:
             raise ValueError("Windy API key is required")
         self._api_key = api_key
         self._model = model
         self._timeout = timeout
-        self._session = requests.Session()
+        self._include_precip = include_precip
+        self._use_http2 = use_http2
+        # request body fields that are the same for every call; only lat/lon are added per request
+        self._payload_template = {
+            "model": model,
+            "parameters": ("temp", "precip") if include_precip else ("temp",),  # orjson writes tuples as arrays
+            "key": api_key
+        }
+        self._session = _SESSION  # shared, never closed per instance
+        self._async_client: httpx.AsyncClient | None = None
+        # (lat, lon rounded like the payload, model, days) -> forecasts
+        self._cache: TTLCache = TTLCache(maxsize=FORECAST_CACHE_SIZE, ttl=FORECAST_CACHE_TTL_SECONDS)
+        self._cache_lock = threading.Lock()
+
+    def _build_payload(self, latitude: float, longitude: float) -> dict:
+        """
+        Validate coordinates and build the Windy API request body.
+
+        Raises:
+            ValueError: If coordinates are invalid
+        """
+        if not (-90.0 <= latitude <= 90.0):
+            raise ValueError(f"Invalid latitude: {latitude}")
+        if not (-180.0 <= longitude <= 180.0):
+            raise ValueError(f"Invalid longitude: {longitude}")
+
+        return {
+            "lat": round(latitude, 2),  # Windy rounds to 2 decimals
+            "lon": round(longitude, 2),
+            **self._payload_template
+        }
+
+    def _cache_key(self, latitude: float, longitude: float, days: int) -> tuple:
+        return round(latitude, 2), round(longitude, 2), self._model, days
+
+    def _cached_forecast(self, key: tuple) -> List[DayForecast] | None:
+        with self._cache_lock:
+            forecasts = self._cache.get(key)
+        return list(forecasts) if forecasts is not None else None  # callers get their own list
+
+    def _store_forecast(self, key: tuple, forecasts: List[DayForecast]) -> None:
+        with self._cache_lock:
+            self._cache[key] = list(forecasts)
+
+    def _parse_response(self, data: dict, days: int) -> List[DayForecast]:
+        """Turn a Windy API response into daily forecasts."""
+        # Windy returns timestamps (ts) in milliseconds and hourly data
+        timestamps = data.get("ts", [])
+        temps = data.get("temp-surface", [])  # Temperature at surface level
+        precip = data.get("precip-surface", [])  # Precipitation at surface, missing if not requested
+
+        if not timestamps or not temps:
+            raise ValueError("Invalid response from Windy API")
+
+        # Group hourly data into daily forecasts
+        return self._aggregate_to_daily(timestamps, temps, precip, days)
 
     def get_forecast(
             self,
@@ -43,53 +168,129 @@ class WindyService(WeatherService):
             days: Number of days to forecast
 
         Returns:
-            List of DayForecast objects validated by Pydantic
+            List of DayForecast objects
 
         Raises:
             ValueError: If coordinates are invalid
-            requests.HTTPError: If API request fails
+            TimeoutError: If the API does not answer in time
+            RuntimeError: If API request fails
         """
-        if not (-90.0 <= latitude <= 90.0):
-            raise ValueError(f"Invalid latitude: {latitude}")
-        if not (-180.0 <= longitude <= 180.0):
-            raise ValueError(f"Invalid longitude: {longitude}")
-
-        # Windy API request body
-        payload = {
-            "lat": round(latitude, 2),  # Windy rounds to 2 decimals
-            "lon": round(longitude, 2),
-            "model": self._model,
-            "parameters": ["temp", "precip"],
-            "key": self._api_key
-        }
+        payload = self._build_payload(latitude, longitude)
+        key = self._cache_key(latitude, longitude, days)
+        cached = self._cached_forecast(key)
+        if cached is not None:
+            return cached
 
+        body = orjson.dumps(payload)  # Content-Type is set on the session/client
         try:
-            response = self._session.post(
-                self.BASE_URL,
-                json=payload,
-                timeout=self._timeout
-            )
+            if self._use_http2:
+                response = _get_http2_client().post(self.BASE_URL, content=body, timeout=self._timeout)
+            else:
+                response = self._session.post(self.BASE_URL, data=body, timeout=self._timeout)
             response.raise_for_status()
-            data = response.json()
-        except requests.Timeout:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise ValueError("Invalid response from Windy API")
+        except (requests.Timeout, httpx.TimeoutException):
             raise TimeoutError(f"Request timed out after {self._timeout}s")
-        except requests.RequestException as e:
+        except (requests.RequestException, httpx.HTTPError) as e:
             raise RuntimeError(f"Windy API request failed: {e}")
 
-        # Parse Windy response
-        # Windy returns timestamps (ts) in milliseconds and hourly data
-        timestamps = data.get("ts", [])
-        temps = data.get("temp-surface", [])  # Temperature at surface level
-        precip = data.get("precip-surface", [])  # Precipitation at surface
+        forecasts = self._parse_response(data, days)
+        self._store_forecast(key, forecasts)
+        return forecasts
 
-        if not timestamps or not temps:
-            raise ValueError("Invalid response from Windy API")
+    def get_forecasts(
+            self,
+            points: List[tuple[float, float]],
+            days: int,
+    ) -> List[List[DayForecast]]:
+        """
+        Fetch forecasts for many locations concurrently over the shared connection pool.
 
-        # Group hourly data into daily forecasts
-        forecasts = self._aggregate_to_daily(timestamps, temps, precip, days)
+        Args:
+            points: (latitude, longitude) pairs
+            days: Number of days to forecast
+
+        Returns:
+            One list of DayForecast objects per point, in input order
+        """
+        if not points:
+            return []
+        with ThreadPoolExecutor(max_workers=min(MAX_FORECAST_WORKERS, len(points))) as executor:
+            return list(executor.map(lambda point: self.get_forecast(point[0], point[1], days), points))
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Pooled async client, created on first use (inside the caller's event loop)."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                http2=self._use_http2,
+                headers=_HEADERS,
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            )
+        return self._async_client
+
+    async def get_forecast_async(
+            self,
+            latitude: float,
+            longitude: float,
+            days: int,
+    ) -> List[DayForecast]:
+        """
+        Async variant of get_forecast; many forecasts can be fetched concurrently
+        (e.g. with asyncio.gather) over one connection pool.
+
+        Raises:
+            ValueError: If coordinates are invalid
+            TimeoutError: If the API does not answer in time
+            RuntimeError: If API request fails
+        """
+        payload = self._build_payload(latitude, longitude)
+        key = self._cache_key(latitude, longitude, days)
+        cached = self._cached_forecast(key)
+        if cached is not None:
+            return cached
 
+        try:
+            response = await self._get_async_client().post(self.BASE_URL, content=orjson.dumps(payload))
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise ValueError("Invalid response from Windy API")
+        except httpx.TimeoutException:
+            raise TimeoutError(f"Request timed out after {self._timeout}s")
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Windy API request failed: {e}")
+
+        forecasts = self._parse_response(data, days)
+        self._store_forecast(key, forecasts)
         return forecasts
 
+    def close(self) -> None:
+        """Drop cached forecasts; the pooled HTTP session is shared by all instances and stays open."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def __enter__(self) -> "WindyService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def aclose(self) -> None:
+        """Close the async client, if one was created, and drop cached forecasts."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    async def __aenter__(self) -> "WindyService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def _aggregate_to_daily(
             self,
             timestamps: List[int],
@@ -109,51 +310,66 @@ class WindyService(WeatherService):
         Returns:
             List of DayForecast objects
         """
-        daily_data = {}
-
-        for i, ts_ms in enumerate(timestamps):
-            # Convert milliseconds to datetime
-            dt = datetime.fromtimestamp(ts_ms / 1000.0)
-            date_key = dt.date()
+        # nothing to aggregate (stops at the first temperature in the usual case)
+        if days <= 0 or all(temp is None for temp in temps):
+            return []
 
-            temp = temps[i] if i < len(temps) else None
-            prec = precip[i] if i < len(precip) else 0.0
-
-            if temp is None:
+        n = min(len(timestamps), len(temps))
+        # Windy returns the samples in time order, so each local day is a contiguous
+        # run that is reduced with one slice. A sample only needs a datetime when it
+        # falls outside the current day's [midnight, next midnight) range in ms, so
+        # there is one conversion per day rather than per sample (exact across DST).
+        run_starts: List[int] = []
+        run_dates = []
+        in_order = True  # no sample belongs to a day before the previous sample's day
+        day_start_ms = day_end_ms = 0.0
+        for i, ts_ms in enumerate(timestamps[:n]):
+            if day_start_ms <= ts_ms < day_end_ms:
                 continue
+            if ts_ms < day_start_ms and run_starts:
+                in_order = False
+            date_key = datetime.fromtimestamp(ts_ms / 1000.0).date()
+            day_start_ms = datetime.combine(date_key, time()).timestamp() * 1000.0
+            day_end_ms = datetime.combine(date_key + timedelta(days=1), time()).timestamp() * 1000.0
+            run_starts.append(i)
+            run_dates.append(date_key)
+        run_starts.append(n)
 
-            if date_key not in daily_data:
-                daily_data[date_key] = {
-                    'temps': [],
-                    'precip': 0.0
-                }
-
-            daily_data[date_key]['temps'].append(temp)
-            daily_data[date_key]['precip'] += prec or 0.0
-
-        # Convert to DayForecast objects
-        forecasts: List[DayForecast] = []
-        sorted_dates = sorted(daily_data.keys())
-
-        for date_key in sorted_dates[:days]:
-            day_data = daily_data[date_key]
-            temps_list = day_data['temps']
-
-            if not temps_list:
+        daily_data = {}  # date -> [min temp, max temp, precipitation]
+        for date_key, run_start, run_end in zip(run_dates, run_starts, run_starts[1:]):
+            if in_order and len(daily_data) == days:
+                break  # the remaining days would be cut off below anyway
+            run_temps = temps[run_start:run_end]
+            valid_temps = [temp for temp in run_temps if temp is not None]
+            if not valid_temps:
                 continue
+            # samples without a temperature are skipped entirely, precipitation included
+            run_precip = sum(
+                prec or 0.0 for temp, prec in zip(run_temps, precip[run_start:run_end]) if temp is not None
+            )
+            day_data = daily_data.get(date_key)
+            if day_data is None:
+                daily_data[date_key] = [min(valid_temps), max(valid_temps), run_precip]
+            else:  # the same day again, only if the samples were out of order
+                day_data[0] = min(day_data[0], *valid_temps)
+                day_data[1] = max(day_data[1], *valid_temps)
+                day_data[2] += run_precip
 
+        # Convert to DayForecast objects; the values are floats computed above, so
+        # validation is skipped and only the model's precipitation >= 0 rule is checked
+        forecasts: List[DayForecast] = []
+        for date_key in sorted(daily_data)[:days]:
+            min_temp, max_temp, day_precip = daily_data[date_key]
+            day_precip = float(day_precip)
+            if not day_precip >= 0.0:  # also rejects NaN
+                raise ValueError(f"Invalid precipitation from Windy API: {day_precip}")
             forecasts.append(
-                DayForecast(
+                DayForecast.model_construct(
                     date=date_key,
-                    min_temp=float(min(temps_list)),
-                    max_temp=float(max(temps_list)),
-                    precipitation_mm=float(day_data['precip'])
+                    min_temp=float(min_temp),
+                    max_temp=float(max_temp),
+                    precipitation_mm=day_precip
                 )
             )
 
         return forecasts
-
-    def __del__(self):
-        """Close the session on cleanup."""
-        if hasattr(self, '_session'):
-            self._session.close()